@@ -0,0 +1,107 @@
+# -----------------------------------------------------------------------------
+# array_board.py
+#
+# 대형 보드(벽면 디스플레이 등)용 GameLogic.
+# 그리드를 NumPy 색상 인덱스 배열로 관리하고, 줄 검사/제거를 벡터 연산으로,
+# 그리기를 surfarray + 한 번의 확대(scale)로 처리합니다.
+#
+# 칸마다 pygame.draw.rect를 두 번 호출하는 기본 GameLogic과 달리
+# 보드 크기가 커져도 프레임마다 드는 비용이 거의 늘지 않습니다.
+# (대신 칸 테두리는 그리지 않습니다.)
+# -----------------------------------------------------------------------------
+
+import numpy as np
+import pygame
+
+from settings import *
+from game_logic import GameLogic
+
+# 팔레트: 0번은 빈칸(투명), 1번부터 TETROMINO_COLORS 순서
+PALETTE = [BLACK] + TETROMINO_COLORS
+COLOR_INDEX = {color: i + 1 for i, color in enumerate(TETROMINO_COLORS)}
+
+
+class ArrayGameLogic(GameLogic):
+    """
+    NumPy 배열 그리드를 사용하는 GameLogic.
+    self.grid[y, x] 값은 PALETTE의 인덱스입니다 (0은 빈 공간).
+    """
+    def __init__(self, telemetry=None, rows=GRID_ROWS, cols=GRID_COLS, block_size=BLOCK_SIZE,
+                 screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        super().__init__(telemetry, rows, cols, block_size, screen_size)
+
+        # 그리드 1칸 = 1픽셀인 8비트 팔레트 서피스 (빈칸은 colorkey로 투명 처리)
+        self._index_surface = pygame.Surface((cols, rows), depth=8)
+        self._index_surface.set_palette(PALETTE)
+        self._scaled_surface = None
+        self._dirty = True
+
+    def _empty_grid(self):
+        return np.zeros((self.rows, self.cols), dtype=np.uint8)
+
+    @staticmethod
+    def _cells(shape):
+        """모양에서 채워진 칸의 (행, 열) 인덱스 배열을 반환합니다."""
+        return np.nonzero(np.asarray(shape, dtype=bool))
+
+    def _check_collision(self, tetromino):
+        """
+        주어진 테트로미노가 그리드 경계나 다른 블록과 충돌하는지 확인합니다.
+        """
+        ys, xs = self._cells(tetromino.shape)
+        ys = ys + tetromino.y
+        xs = xs + tetromino.x
+
+        # 1. 그리드 경계를 벗어나는지 확인
+        if xs.min() < 0 or xs.max() >= self.cols or ys.min() < 0 or ys.max() >= self.rows:
+            return True
+        # 2. 다른 블록과 겹치는지 확인
+        return bool(self.grid[ys, xs].any())
+
+    def _lock_tetromino(self):
+        """
+        현재 테트로미노를 그리드에 고정시키고, 다음 블록을 준비합니다.
+        """
+        if self.current_tetromino:
+            ys, xs = self._cells(self.current_tetromino.shape)
+            ys = ys + self.current_tetromino.y
+            xs = xs + self.current_tetromino.x
+            inside = (ys >= 0) & (ys < self.rows)
+            self.grid[ys[inside], xs[inside]] = COLOR_INDEX.get(self.current_tetromino.color, 1)
+            self._dirty = True
+
+            if self.telemetry:
+                self.telemetry.record('lock', block=self.current_tetromino.name,
+                                      x=self.current_tetromino.x, y=self.current_tetromino.y)
+
+            self._clear_lines()
+            self.current_tetromino = None
+
+    def _clear_lines(self):
+        """꽉 찬 줄을 한 번에 찾아 제거하고, 남은 줄을 아래로 내립니다."""
+        full = (self.grid != 0).all(axis=1)
+        lines_cleared = int(full.sum())
+
+        if lines_cleared > 0:
+            self.score += (lines_cleared ** 2) * 100
+            if self.telemetry:
+                self.telemetry.record('lines_cleared', lines=lines_cleared, score=self.score)
+            kept = self.grid[~full]
+            self.grid[:lines_cleared] = 0
+            self.grid[lines_cleared:] = kept
+            self._dirty = True
+
+    def draw_grid(self, screen):
+        """
+        고정된 블록들을 그립니다.
+        그리드가 바뀐 경우에만 팔레트 서피스를 갱신하고 한 번 확대합니다.
+        """
+        if self._dirty:
+            # surfarray는 (x, y) 순서이므로 전치해서 넘김
+            pygame.surfarray.blit_array(self._index_surface, self.grid.T)
+            scaled = pygame.transform.scale(self._index_surface, (self.grid_width, self.grid_height))
+            # 화면 형식으로 한 번 변환해 두면 매 프레임 blit 때 변환이 필요 없음
+            self._scaled_surface = scaled.convert()
+            self._scaled_surface.set_colorkey(PALETTE[0], pygame.RLEACCEL)
+            self._dirty = False
+        screen.blit(self._scaled_surface, (self.grid_x, self.grid_y))
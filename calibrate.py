@@ -0,0 +1,302 @@
+# -----------------------------------------------------------------------------
+# calibrate.py
+#
+# 녹화된 세션으로 포즈 인식 임계값과 템플릿을 평가하는 오프라인 도구.
+#
+# 입력: telemetry.py가 남긴 세션 파일(.jsonl, settings.RECORD_LANDMARKS = True로 기록)
+#   - 'landmarks' 이벤트: 인식 단계의 프레임별 랜드마크 (points = [[x, y], ...] 픽셀 좌표, size = [카메라 width, height])
+#     게임이 실제로 get_body_vectors()에 넘긴 값(움직임 예측을 적용한 뒤의 위치)입니다.
+#   - 'recognition' 이벤트: 인식 단계 하나가 끝난 시점
+#   - 'selection' 이벤트: 플레이어가 실제로 고른 블록 -> 직전 인식 단계의 정답으로 사용
+#     (zone이 None이면 무작위로 고른 것이므로 정답으로 쓰지 않음)
+#   ('landmarks' 이벤트에 'label' 값이 있으면 그 값을 정답으로 우선 사용)
+#
+# 주의: 'selection'으로 정한 정답은 플레이어가 인식기의 top-3 후보 중에서 고른 블록입니다.
+# 원래 만들려던 블록이 top-3에 들지 못한 인식 단계는 틀린 정답으로 기록되므로,
+# 정밀도/재현율이 현재 임계값 쪽으로 치우칩니다. 정확한 평가에는 라벨 기록 모드
+# (settings.CALIBRATION_TARGETS + RECORD_LANDMARKS)로 녹화한 세션을 사용하세요.
+#
+# 게임과 같은 결과가 나오도록 각도는 SimilarityCache와 같은 간격으로 양자화합니다.
+# --self-check 를 주면 평가 전에 첫 인식 단계의 유사도를 PoseDetector.compare_poses와 한 번 대조합니다.
+#
+# 출력: 임계값 x 템플릿 변형 조합마다 혼동 행렬, 템플릿별 정밀도/재현율, 인식 시간 분포
+#
+# 사용법:
+#   python calibrate.py sessions/*.jsonl --thresholds 0.6 0.65 0.7 0.75 \
+#       --variants variants.json --workers 8 --output report.json
+#   (--quantization 0 이면 양자화하지 않음)
+#
+# variants.json 형식: {"변형 이름": {"템플릿 키": {"right_arm": 90, ...}, ...}, ...}
+# (적지 않은 템플릿/부위는 block_templates.py 값을 그대로 사용)
+# -----------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from block_templates import POSE_TEMPLATES
+from pose_detector import PoseDetector
+from settings import POSE_SIMILARITY_THRESHOLD, SIMILARITY_CACHE_QUANTIZATION
+from telemetry import read_events
+
+BODY_PARTS = ['right_arm', 'left_arm', 'right_leg', 'left_leg', 'right_body', 'left_body']
+NO_MATCH = 'none'  # 임계값을 넘는 템플릿이 없었던 경우
+NAME_TO_KEY = {template['name']: key for key, template in POSE_TEMPLATES.items()}
+
+
+# ---------------------------------------------------------------------
+# 세션 읽기
+# ---------------------------------------------------------------------
+def load_windows(path):
+    """
+    세션 파일을 인식 단계 단위로 나눕니다.
+
+    :return: (정답 템플릿 키, 시각 배열, 각도 배열 (프레임 수, 6)) 리스트.
+             정답을 알 수 없는 인식 단계는 제외합니다.
+    """
+    windows = []
+    pending = []       # 정답(selection)을 기다리는 인식 단계들
+    frames = []        # 현재 인식 단계의 (시각, 벡터, 라벨)
+
+    for e in read_events(path):
+        name = e.get('event')
+        if name == 'landmarks':
+            lm_list = [[i, x, y] for i, (x, y) in enumerate(e['points'])]
+            vectors = PoseDetector.get_body_vectors(lm_list)
+            if vectors:
+                frames.append((e['t'], [vectors[p] for p in BODY_PARTS], e.get('label')))
+        elif name == 'recognition':
+            if frames:
+                pending.append(frames)
+            frames = []
+        elif name == 'selection':
+            # zone이 없으면 무작위 선택이므로 직전 인식 단계는 프레임 라벨이 있을 때만 사용
+            label = NAME_TO_KEY.get(e.get('block')) if e.get('zone') is not None else None
+            for window in pending:
+                windows.append(_to_window(window, label))
+            pending = []
+
+    # 선택 없이 끝난 인식 단계는 프레임 라벨이 있을 때만 사용
+    for window in pending + ([frames] if frames else []):
+        windows.append(_to_window(window, None))
+    return [w for w in windows if w[0] in POSE_TEMPLATES]
+
+
+def _to_window(frames, label):
+    explicit = [f[2] for f in frames if f[2]]
+    if explicit:
+        label = Counter(explicit).most_common(1)[0][0]
+    times = np.array([f[0] for f in frames], dtype=np.float64)
+    angles = np.array([f[1] for f in frames], dtype=np.float64)
+    return label, times - times[0], angles
+
+
+# ---------------------------------------------------------------------
+# 평가
+# ---------------------------------------------------------------------
+def build_variants(variant_overrides):
+    """
+    템플릿 변형 목록을 만듭니다.
+
+    :return: {변형 이름: (템플릿 키 리스트, 각도 배열 (템플릿 수, 6))}
+    """
+    variants = {'base': {}}
+    variants.update(variant_overrides or {})
+    built = {}
+    for name, overrides in variants.items():
+        keys = list(POSE_TEMPLATES)
+        rows = []
+        for key in keys:
+            vectors = dict(POSE_TEMPLATES[key]['vectors'])
+            vectors.update(overrides.get(key, {}))
+            rows.append([vectors[p] for p in BODY_PARTS])
+        built[name] = (keys, np.array(rows, dtype=np.float64))
+    return built
+
+
+def quantize(angles, quantization):
+    """SimilarityCache._quantize와 같은 방식으로 각도를 반올림합니다 (0이면 그대로)."""
+    if not quantization:
+        return angles
+    return (np.round(angles / quantization) * quantization) % 360
+
+
+def similarity_matrix(angles, template_angles):
+    """
+    PoseDetector.compare_poses와 같은 방식의 유사도를 한 번에 계산합니다.
+
+    :param angles: 프레임별 각도 (F, 6)
+    :param template_angles: 템플릿별 각도 (T, 6)
+    :return: 유사도 (F, T)
+    """
+    diff = np.abs(angles[:, None, :] - template_angles[None, :, :])
+    diff = np.minimum(diff, 360 - diff)
+    return np.maximum(0, 1.0 - diff.sum(axis=2) / (180 * len(BODY_PARTS)))
+
+
+def check_similarity(angles, keys, template_angles, sims):
+    """
+    similarity_matrix 결과가 게임의 PoseDetector.compare_poses와 같은지 확인합니다.
+
+    :raises ValueError: 계산 방식이 달라졌을 때
+    """
+    for f, frame in enumerate(angles):
+        user_vectors = dict(zip(BODY_PARTS, frame))
+        for t, key in enumerate(keys):
+            expected = PoseDetector.compare_poses(dict(zip(BODY_PARTS, template_angles[t])), user_vectors)
+            if not np.isclose(sims[f, t], expected):
+                raise ValueError(f"similarity_matrix differs from PoseDetector.compare_poses "
+                                 f"for template {key}: {sims[f, t]} != {expected}")
+
+
+def self_check(path, variants, quantization=SIMILARITY_CACHE_QUANTIZATION):
+    """세션 파일의 첫 인식 단계로 모든 변형에 대해 check_similarity를 실행합니다."""
+    windows = load_windows(path)
+    if not windows:
+        return
+    angles = quantize(windows[0][2], quantization)
+    for keys, template_angles in variants.values():
+        check_similarity(angles, keys, template_angles, similarity_matrix(angles, template_angles))
+
+
+def evaluate_file(path, variants, thresholds, quantization=SIMILARITY_CACHE_QUANTIZATION):
+    """
+    세션 파일 하나를 모든 변형/임계값 조합으로 평가합니다 (프로세스 풀에서 실행).
+
+    :param quantization: 게임의 SimilarityCache와 같은 각도 양자화 간격 (0이면 양자화하지 않음)
+    :return: {(변형, 임계값): {'confusion': {(정답, 예측): 횟수}, 'top3': 횟수,
+                                'windows': 횟수, 'times': [인식 시간]}}
+    """
+    results = defaultdict(lambda: {'confusion': Counter(), 'top3': 0, 'windows': 0, 'times': []})
+    for label, times, angles in load_windows(path):
+        angles = quantize(angles, quantization)
+        for variant, (keys, template_angles) in variants.items():
+            sims = similarity_matrix(angles, template_angles)
+            top1 = sims.argmax(axis=1)
+            top1_score = sims[np.arange(len(sims)), top1]
+            label_index = keys.index(label)
+
+            for threshold in thresholds:
+                # main()의 인식 단계와 동일: 임계값을 넘은 top1을 세고 가장 많이 나온 것을 선택
+                passed = top1[top1_score > threshold]
+                counts = np.bincount(passed, minlength=len(keys))
+                ranked = [keys[i] for i in np.argsort(-counts, kind='stable') if counts[i] > 0]
+                predicted = ranked[0] if ranked else NO_MATCH
+
+                r = results[(variant, threshold)]
+                r['windows'] += 1
+                r['confusion'][(label, predicted)] += 1
+                if label in ranked[:3]:
+                    r['top3'] += 1
+
+                # 인식 시간: 정답 템플릿이 처음으로 임계값을 넘은 top1이 된 시점
+                hit = np.nonzero((top1 == label_index) & (top1_score > threshold))[0]
+                if len(hit):
+                    r['times'].append(float(times[hit[0]]))
+    return dict(results)
+
+
+def merge(results_list):
+    merged = defaultdict(lambda: {'confusion': Counter(), 'top3': 0, 'windows': 0, 'times': []})
+    for results in results_list:
+        for combo, r in results.items():
+            m = merged[combo]
+            m['confusion'].update(r['confusion'])
+            m['top3'] += r['top3']
+            m['windows'] += r['windows']
+            m['times'].extend(r['times'])
+    return merged
+
+
+def summarize(r):
+    """혼동 행렬로부터 정확도, 템플릿별 정밀도/재현율, 인식 시간 분포를 계산합니다."""
+    confusion = r['confusion']
+    per_template = {}
+    for key in POSE_TEMPLATES:
+        tp = confusion[(key, key)]
+        predicted = sum(n for (_, p), n in confusion.items() if p == key)
+        actual = sum(n for (t, _), n in confusion.items() if t == key)
+        if actual or predicted:
+            per_template[key] = {
+                'precision': tp / predicted if predicted else 0.0,
+                'recall': tp / actual if actual else 0.0,
+                'support': actual,
+            }
+
+    times = sorted(r['times'])
+    correct = sum(n for (t, p), n in confusion.items() if t == p)
+    return {
+        'windows': r['windows'],
+        'accuracy': correct / r['windows'] if r['windows'] else 0.0,
+        'top3_accuracy': r['top3'] / r['windows'] if r['windows'] else 0.0,
+        'per_template': per_template,
+        'recognition_time': {
+            'count': len(times),
+            'p50': times[len(times) // 2] if times else None,
+            'p90': times[int(len(times) * 0.9)] if times else None,
+            'max': times[-1] if times else None,
+        },
+        'confusion': {f"{t}->{p}": n for (t, p), n in sorted(confusion.items())},
+    }
+
+
+def print_confusion(confusion):
+    labels = sorted({t for t, _ in confusion})
+    columns = labels + sorted({p for _, p in confusion} - set(labels))
+    print("true \\ pred".ljust(12) + "".join(c[:6].rjust(7) for c in columns))
+    for t in labels:
+        print(t.ljust(12) + "".join(str(confusion[(t, p)]).rjust(7) for p in columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate pose thresholds/templates on recorded sessions.")
+    parser.add_argument('sessions', nargs='+', help="session .jsonl files recorded with RECORD_LANDMARKS")
+    parser.add_argument('--thresholds', nargs='+', type=float, default=[POSE_SIMILARITY_THRESHOLD])
+    parser.add_argument('--variants', help="JSON file with template variants")
+    parser.add_argument('--quantization', type=float, default=SIMILARITY_CACHE_QUANTIZATION,
+                        help="angle quantization used by the game's SimilarityCache (0 to disable)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help="write the full report as JSON")
+    parser.add_argument('--self-check', action='store_true',
+                        help="verify similarity_matrix against PoseDetector.compare_poses before evaluating")
+    args = parser.parse_args()
+
+    overrides = None
+    if args.variants:
+        with open(args.variants, encoding='utf-8') as f:
+            overrides = json.load(f)
+    variants = build_variants(overrides)
+    if args.self_check:
+        self_check(args.sessions[0], variants, args.quantization)
+
+    # 파일 단위로 프로세스 풀에 분배
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(evaluate_file, path, variants, args.thresholds, args.quantization) for path in args.sessions]
+        merged = merge(f.result() for f in futures)
+
+    report = {f"{variant}@{threshold}": summarize(r) for (variant, threshold), r in sorted(merged.items())}
+    for combo, s in report.items():
+        t = s['recognition_time']
+        p50 = f"{t['p50']:.2f}s" if t['p50'] is not None else "-"
+        print(f"{combo:<24} windows {s['windows']:>5}  acc {s['accuracy']:.3f}  "
+              f"top3 {s['top3_accuracy']:.3f}  time p50 {p50}")
+
+    if merged:
+        best = max(merged, key=lambda combo: report[f"{combo[0]}@{combo[1]}"]['accuracy'])
+        print(f"\nbest: {best[0]}@{best[1]}")
+        print_confusion(merged[best]['confusion'])
+        print("\ntemplate     precision  recall  support")
+        for key, m in report[f"{best[0]}@{best[1]}"]['per_template'].items():
+            print(f"{key:<12} {m['precision']:>9.3f} {m['recall']:>7.3f} {m['support']:>8}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
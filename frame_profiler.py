@@ -0,0 +1,338 @@
+# -----------------------------------------------------------------------------
+# frame_profiler.py
+#
+# 프레임 루프의 메모리 할당을 측정하는 계측 도구.
+# (프레임/단계별 할당량, 상위 할당 위치, GC 정지 시간, 할당 예산 검사)
+#
+# 측정하는 값은 세 가지입니다.
+#   - heap 바이트: tracemalloc이 보는 Python/NumPy 메모리의 프레임 중 최고점 증가량
+#   - GC 객체 수: GC가 추적하는 객체(리스트, 딕셔너리 등)의 순 생성 수.
+#                 gen0 카운터를 누적한 값으로, GC가 돌기까지 쌓이는 양이므로 GC 정지의 직접 원인입니다.
+#   - Surface: pygame Surface 픽셀 버퍼는 SDL이 직접 할당하므로 tracemalloc에 보이지 않습니다.
+#              생성하는 곳에서 count_surface()로 넘겨 받은 개수와 바이트를 따로 셉니다.
+#
+# 프레임 전체 할당량은 매 프레임 크기가 같은 카메라/미리보기 버퍼가 대부분을 차지하므로,
+# 회귀를 잡으려면 단계별 예산(stage_budgets)을 사용합니다.
+# 이런 고정 크기 Surface는 count_surface(..., fixed=True)로 넘기면 예산 계산에서 빠집니다.
+#
+# tracemalloc을 사용하므로 켜져 있는 동안에는 게임이 눈에 띄게 느려집니다.
+# 평소 플레이에서는 settings.MEMORY_PROFILE = False 로 꺼 둡니다.
+# -----------------------------------------------------------------------------
+
+import functools
+import gc
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class MemoryBudgetExceeded(Exception):
+    """프레임당 할당량이 설정된 예산을 넘었을 때 발생하는 예외."""
+
+
+class FrameMemoryProfiler:
+    """
+    프레임 단위로 메모리 할당을 기록하는 클래스.
+
+    사용 예:
+        profiler.begin_frame()
+        with profiler.stage('camera'):
+            ...
+        profiler.end_frame()
+    """
+    def __init__(self, budget_bytes=0, budget_objects=0, stage_budgets=None, top_n=10,
+                 snapshot_interval=300, trace_depth=1):
+        """
+        :param budget_bytes: 프레임당 허용 할당량 (heap 바이트 + 고정 크기가 아닌 Surface 바이트, 0이면 검사하지 않음)
+        :param budget_objects: 프레임당 허용 GC 객체 생성 수 (0이면 검사하지 않음)
+        :param stage_budgets: 단계별 프레임당 허용 할당량 {단계 이름: 바이트} (계산 방식은 budget_bytes와 같음)
+        :param top_n: 리포트에 보여줄 상위 할당 위치 개수
+        :param snapshot_interval: 몇 프레임마다 tracemalloc 스냅샷을 비교할지
+        :param trace_depth: tracemalloc이 저장할 호출 스택 깊이
+        """
+        self.budget_bytes = budget_bytes
+        self.budget_objects = budget_objects
+        self.stage_budgets = stage_budgets or {}
+        self.top_n = top_n
+        self.snapshot_interval = snapshot_interval
+        self.trace_depth = trace_depth
+
+        self.frame_count = 0
+        self.frame_bytes = []                # 프레임별 최대 할당량 (peak - 시작 시점)
+        self.frame_net_bytes = []            # 프레임별 순 증가량 (끝 - 시작)
+        self.stage_bytes = defaultdict(list) # 단계별 최대 할당량 (한 프레임에 여러 번 들어가면 합)
+        self.frame_objects = []              # 프레임별 GC 객체 생성 수
+        self.stage_objects = defaultdict(list)
+        self.frame_surfaces = []             # 프레임별 (Surface 개수, Surface 바이트, 그중 고정 크기 바이트)
+        self.stage_surfaces = defaultdict(lambda: [0, 0])  # 단계별 누적 (개수, 바이트)
+        self.over_budget_frames = 0
+        self.over_budget_stages = defaultdict(int)  # 단계별 예산을 넘은 프레임 수
+        self.top_sites = []                  # 최근 스냅샷 비교 결과 (StatisticDiff 목록)
+
+        self.gc_pauses = []                  # (세대, 정지 시간(초))
+        self._gc_start = None
+        self._gc_collected_count = 0         # GC가 돌기 직전까지 쌓였던 gen0 카운트의 합
+
+        self._stage = None
+        self._in_frame = False
+        self._frame_objects_start = 0
+        self._frame_surface_count = 0
+        self._frame_surface_bytes = 0
+        self._frame_fixed_bytes = 0
+        self._frame_stages = {}              # 현재 프레임의 단계별 [heap 바이트, GC 객체 수, 예산 대상 Surface 바이트]
+
+        self._frame_start = 0
+        self._frame_peak = 0
+        self._last_snapshot = None
+        self._running = False
+
+    # ---------------------------------------------------------------------
+    # 시작 / 종료
+    # ---------------------------------------------------------------------
+    def start(self):
+        """tracemalloc 추적과 GC 콜백을 시작합니다."""
+        if self._running:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_depth)
+        gc.callbacks.append(self._on_gc)
+        self._last_snapshot = self._take_snapshot()
+        self._running = True
+
+    def stop(self):
+        """추적을 멈추고 GC 콜백을 제거합니다."""
+        if not self._running:
+            return
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        tracemalloc.stop()
+        self._running = False
+
+    def _on_gc(self, phase, info):
+        """GC 시작/종료 시점을 받아 정지 시간을 기록합니다."""
+        if phase == 'start':
+            # 수집이 끝나면 gen0 카운트가 0이 되므로 지금까지의 값을 누적해 둠
+            self._gc_collected_count += gc.get_count()[0]
+            self._gc_start = time.perf_counter()
+        elif phase == 'stop' and self._gc_start is not None:
+            self.gc_pauses.append((info.get('generation', -1), time.perf_counter() - self._gc_start))
+            self._gc_start = None
+
+    def _objects_allocated(self):
+        """측정 시작 후 GC 추적 객체의 누적 순 생성 수."""
+        return self._gc_collected_count + gc.get_count()[0]
+
+    def count_surface(self, surface, fixed=False):
+        """
+        새로 만든 Surface를 기록하고 그대로 반환합니다.
+        (예: text = profiler.count_surface(font.render(...)))
+
+        :param fixed: 매 프레임 같은 크기로 만드는 버퍼(카메라 영상 등)면 True. 예산 계산에서 제외
+        """
+        if self._running:
+            size = surface.get_width() * surface.get_height() * surface.get_bytesize()
+            self._frame_surface_count += 1
+            self._frame_surface_bytes += size
+            if fixed:
+                self._frame_fixed_bytes += size
+            if self._stage:
+                totals = self.stage_surfaces[self._stage]
+                totals[0] += 1
+                totals[1] += size
+                if not fixed:
+                    self._frame_stages[self._stage][2] += size
+        return surface
+
+    def _take_snapshot(self):
+        # 계측 도구 자신의 할당은 결과에서 제외
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+
+    # ---------------------------------------------------------------------
+    # 프레임 / 단계 측정
+    # ---------------------------------------------------------------------
+    def begin_frame(self):
+        """
+        한 프레임의 측정을 시작합니다.
+        이전 프레임이 end_frame() 없이 끝났다면 (루프의 continue 등) 여기서 마무리합니다.
+        """
+        if not self._running:
+            return
+        if self._in_frame:
+            self.end_frame()
+        self._in_frame = True
+        tracemalloc.reset_peak()
+        self._frame_start = tracemalloc.get_traced_memory()[0]
+        self._frame_peak = self._frame_start
+        self._frame_objects_start = self._objects_allocated()
+        self._frame_surface_count = 0
+        self._frame_surface_bytes = 0
+        self._frame_fixed_bytes = 0
+        self._frame_stages = {}
+
+    def end_frame(self):
+        """
+        한 프레임의 측정을 끝내고, 예산 초과 여부를 반환합니다.
+        snapshot_interval 프레임마다 상위 할당 위치를 갱신합니다.
+        """
+        if not self._running or not self._in_frame:
+            return False
+        self._in_frame = False
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, self._frame_peak)
+        allocated = max(0, peak - self._frame_start)
+        objects = self._objects_allocated() - self._frame_objects_start
+        self.frame_bytes.append(allocated)
+        self.frame_net_bytes.append(current - self._frame_start)
+        self.frame_objects.append(objects)
+        self.frame_surfaces.append((self._frame_surface_count, self._frame_surface_bytes, self._frame_fixed_bytes))
+        # 단계 기록은 프레임이 끝날 때 한 번에 남겨서 프레임 기록과 개수를 맞춤
+        for name, (heap, stage_objects, _) in self._frame_stages.items():
+            self.stage_bytes[name].append(heap)
+            self.stage_objects[name].append(stage_objects)
+        self.frame_count += 1
+
+        if self.snapshot_interval and self.frame_count % self.snapshot_interval == 0:
+            self._update_top_sites()
+
+        budget_bytes = allocated + self._frame_surface_bytes - self._frame_fixed_bytes
+        over_budget = bool((self.budget_bytes and budget_bytes > self.budget_bytes)
+                           or (self.budget_objects and objects > self.budget_objects))
+        for name, limit in self.stage_budgets.items():
+            heap, _, surface_bytes = self._frame_stages.get(name, (0, 0, 0))
+            if limit and heap + surface_bytes > limit:
+                self.over_budget_stages[name] += 1
+                over_budget = True
+        if over_budget:
+            self.over_budget_frames += 1
+        return over_budget
+
+    @contextmanager
+    def stage(self, name):
+        """
+        프레임 안의 한 단계(카메라, 포즈 인식, 그리기 등)의 할당량을 측정합니다.
+        한 프레임에 같은 단계를 여러 번 지나면 합산하고,
+        다른 단계 안에서 다시 호출하면 바깥 단계에 포함시킵니다.
+        """
+        if not self._running or self._stage is not None:
+            yield
+            return
+        # 프레임 전체의 peak를 잃지 않도록 단계 시작 전의 peak를 보관
+        _, frame_peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        objects_start = self._objects_allocated()
+        self._stage = name
+        self._frame_stages.setdefault(name, [0, 0, 0])
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            totals = self._frame_stages[name]
+            totals[0] += max(0, peak - start)
+            totals[1] += self._objects_allocated() - objects_start
+            self._stage = None
+            # reset_peak()로 지워진 프레임 peak 값을 따로 보관
+            self._frame_peak = max(self._frame_peak, frame_peak, peak)
+
+    def profiled(self, name):
+        """함수 호출 전체를 stage(name)으로 측정하는 데코레이터."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def _update_top_sites(self):
+        snapshot = self._take_snapshot()
+        stats = snapshot.compare_to(self._last_snapshot, 'lineno')
+        self.top_sites = [s for s in stats if s.size_diff > 0 or s.count_diff > 0][:self.top_n]
+        self._last_snapshot = snapshot
+
+    # ---------------------------------------------------------------------
+    # 결과
+    # ---------------------------------------------------------------------
+    def check_budget(self):
+        """예산을 넘은 프레임이 있었다면 MemoryBudgetExceeded를 발생시킵니다."""
+        if self.over_budget_frames:
+            max_bytes = max(b + sb - fb for b, (_, sb, fb) in zip(self.frame_bytes, self.frame_surfaces))
+            stages = ", ".join(f"{name} {n}" for name, n in self.over_budget_stages.items())
+            raise MemoryBudgetExceeded(
+                f"{self.over_budget_frames}/{self.frame_count} frames exceeded the allocation budget "
+                f"({self.budget_bytes or '-'} bytes, {self.budget_objects or '-'} objects per frame; "
+                f"max {max_bytes} bytes, {max(self.frame_objects)} objects"
+                + (f"; over stage budgets: {stages})" if stages else ")")
+            )
+
+    @staticmethod
+    def _summary(values):
+        """리스트의 평균 / p95 / 최댓값을 계산합니다."""
+        if not values:
+            return 0, 0, 0
+        ordered = sorted(values)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return sum(ordered) / len(ordered), p95, ordered[-1]
+
+    def _count_by_generation(self):
+        """GC 정지 기록을 세대별 횟수로 집계합니다."""
+        counts = {0: 0, 1: 0, 2: 0}
+        for generation, _ in self.gc_pauses:
+            if generation in counts:
+                counts[generation] += 1
+        return counts
+
+    def report(self):
+        """측정 결과를 사람이 읽을 수 있는 문자열로 반환합니다."""
+        if self._running and self.frame_count % max(1, self.snapshot_interval) != 0:
+            self._update_top_sites()
+
+        lines = [f"=== Memory profile ({self.frame_count} frames) ==="]
+        avg, p95, worst = self._summary(self.frame_bytes)
+        lines.append(f"per-frame heap peak: avg {avg:.0f} B, p95 {p95} B, max {worst} B")
+        avg, p95, worst = self._summary(self.frame_objects)
+        lines.append(f"per-frame gc objects: avg {avg:.0f}, p95 {p95}, max {worst}")
+        avg_count, _, _ = self._summary([c for c, _, _ in self.frame_surfaces])
+        avg, p95, worst = self._summary([b for _, b, _ in self.frame_surfaces])
+        fixed, _, _ = self._summary([f for _, _, f in self.frame_surfaces])
+        lines.append(f"per-frame surfaces: avg {avg_count:.1f} ({avg:.0f} B, fixed buffers {fixed:.0f} B), "
+                     f"p95 {p95} B, max {worst} B")
+        if self.frame_net_bytes:
+            lines.append(f"net heap growth: {sum(self.frame_net_bytes)} B total")
+        if self.budget_bytes or self.budget_objects or self.stage_budgets:
+            lines.append(f"budget: {self.budget_bytes or '-'} B/frame, {self.budget_objects or '-'} objects/frame, "
+                         f"exceeded in {self.over_budget_frames} frames")
+        for name, limit in self.stage_budgets.items():
+            lines.append(f"stage budget: {name} {limit} B/frame, exceeded in {self.over_budget_stages[name]} frames")
+
+        if self.stage_bytes:
+            lines.append("per-stage (heap peak avg / p95 / max, gc objects avg, surfaces/frame, surface B/frame):")
+            frames = max(1, self.frame_count)
+            for name, values in self.stage_bytes.items():
+                avg, p95, worst = self._summary(values)
+                objects, _, _ = self._summary(self.stage_objects[name])
+                count, size = self.stage_surfaces.get(name, (0, 0))
+                lines.append(f"  {name:<12} {avg:>10.0f} {p95:>10} {worst:>10} {objects:>8.0f} "
+                             f"{count / frames:>6.1f} {size / frames:>10.0f}")
+
+        pauses = [p for _, p in self.gc_pauses]
+        if pauses:
+            avg, p95, worst = self._summary(pauses)
+            by_gen = self._count_by_generation()
+            lines.append(
+                f"gc pauses: {len(pauses)} (gen0/1/2 = {by_gen[0]}/{by_gen[1]}/{by_gen[2]}), "
+                f"avg {avg * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, max {worst * 1000:.2f} ms"
+            )
+
+        if self.top_sites:
+            lines.append(f"top {len(self.top_sites)} allocation sites (since last snapshot):")
+            for stat in self.top_sites:
+                frame = stat.traceback[0]
+                lines.append(f"  {frame.filename}:{frame.lineno}  +{stat.size_diff} B  +{stat.count_diff} blocks")
+
+        return "\n".join(lines)
+
@@ -29,19 +29,36 @@ class GameLogic:
     """
     테트리스 게임의 전반적인 로직을 관리하는 클래스.
     """
-    def __init__(self):
+    def __init__(self, telemetry=None, rows=GRID_ROWS, cols=GRID_COLS, block_size=BLOCK_SIZE,
+                 screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        # 세션 기록기 (telemetry.TelemetryWriter, 없으면 기록하지 않음)
+        self.telemetry = telemetry
+
+        # 그리드 크기와 화면 배치 (기본값은 settings.py의 20x10 그리드)
+        # screen_size는 실제로 그리는 서피스 크기 (RENDER_WIDTH x RENDER_HEIGHT)
+        self.rows = rows
+        self.cols = cols
+        self.block_size = block_size
+        self.grid_width = cols * block_size
+        self.grid_height = rows * block_size
+        self.grid_x = (screen_size[0] - self.grid_width) // 2
+        self.grid_y = (screen_size[1] - self.grid_height) // 2
+
         # 게임 그리드를 0으로 초기화 (0은 빈 공간)
-        self.grid = [[0 for _ in range(GRID_COLS)] for _ in range(GRID_ROWS)]
+        self.grid = self._empty_grid()
         self.current_tetromino = None
         self.score = 0
         self.game_over = False
 
+    def _empty_grid(self):
+        return [[0 for _ in range(self.cols)] for _ in range(self.rows)]
+
     def create_tetromino(self, shape_info):
         """
         새로운 테트로미노를 생성하여 게임에 추가합니다.
         """
         # 블록을 그리드 중앙 상단에 위치시킴
-        start_x = GRID_COLS // 2 - len(shape_info['shape'][0]) // 2
+        start_x = self.cols // 2 - len(shape_info['shape'][0]) // 2
         start_y = 0
         self.current_tetromino = Tetromino(start_x, start_y, shape_info)
         
@@ -101,7 +118,7 @@ class GameLogic:
                     grid_y = tetromino.y + y
                     
                     # 1. 그리드 경계를 벗어나는지 확인
-                    if not (0 <= grid_x < GRID_COLS and 0 <= grid_y < GRID_ROWS):
+                    if not (0 <= grid_x < self.cols and 0 <= grid_y < self.rows):
                         return True
                     # 2. 다른 블록과 겹치는지 확인
                     if self.grid[grid_y][grid_x] != 0:
@@ -119,8 +136,12 @@ class GameLogic:
                         grid_x = self.current_tetromino.x + x
                         grid_y = self.current_tetromino.y + y
                         # 그리드에 블록의 색상 정보를 기록
-                        if 0 <= grid_y < GRID_ROWS:
+                        if 0 <= grid_y < self.rows:
                             self.grid[grid_y][grid_x] = self.current_tetromino.color
+
+            if self.telemetry:
+                self.telemetry.record('lock', block=self.current_tetromino.name,
+                                      x=self.current_tetromino.x, y=self.current_tetromino.y)
             
             self._clear_lines()
             self.current_tetromino = None # 현재 블록 없음 상태로 변경
@@ -130,14 +151,16 @@ class GameLogic:
         lines_cleared = 0
         # 꽉 차지 않은 줄만 새로운 그리드에 추가
         new_grid = [row for row in self.grid if any(cell == 0 for cell in row)]
-        lines_cleared = GRID_ROWS - len(new_grid)
+        lines_cleared = self.rows - len(new_grid)
         
         if lines_cleared > 0:
             # 점수 계산 (지운 줄 수에 따라 보너스)
             self.score += (lines_cleared ** 2) * 100
+            if self.telemetry:
+                self.telemetry.record('lines_cleared', lines=lines_cleared, score=self.score)
             # 지운 줄 수만큼 맨 위에 새로운 빈 줄을 추가
             for _ in range(lines_cleared):
-                new_grid.insert(0, [0 for _ in range(GRID_COLS)])
+                new_grid.insert(0, [0 for _ in range(self.cols)])
             self.grid = new_grid
 
     def draw_grid(self, screen):
@@ -147,12 +170,12 @@ class GameLogic:
                 if cell_color != 0:
                     pygame.draw.rect(
                         screen, cell_color,
-                        (GRID_X + x * BLOCK_SIZE, GRID_Y + y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE), 0
+                        (self.grid_x + x * self.block_size, self.grid_y + y * self.block_size, self.block_size, self.block_size), 0
                     )
                     # 블록 테두리
                     pygame.draw.rect(
                         screen, GRAY,
-                        (GRID_X + x * BLOCK_SIZE, GRID_Y + y * BLOCK_SIZE, BLOCK_SIZE, BLOCK_SIZE), 1
+                        (self.grid_x + x * self.block_size, self.grid_y + y * self.block_size, self.block_size, self.block_size), 1
                     )
         
 
@@ -164,13 +187,27 @@ class GameLogic:
                     if cell:
                         pygame.draw.rect(
                             screen, self.current_tetromino.color,
-                            (GRID_X + (self.current_tetromino.x + x) * BLOCK_SIZE,
-                             GRID_Y + (self.current_tetromino.y + y) * BLOCK_SIZE,
-                             BLOCK_SIZE, BLOCK_SIZE), 0
+                            (self.grid_x + (self.current_tetromino.x + x) * self.block_size,
+                             self.grid_y + (self.current_tetromino.y + y) * self.block_size,
+                             self.block_size, self.block_size), 0
                         )
                         pygame.draw.rect(
                             screen, GRAY,
-                            (GRID_X + (self.current_tetromino.x + x) * BLOCK_SIZE,
-                             GRID_Y + (self.current_tetromino.y + y) * BLOCK_SIZE,
-                             BLOCK_SIZE, BLOCK_SIZE), 1
+                            (self.grid_x + (self.current_tetromino.x + x) * self.block_size,
+                             self.grid_y + (self.current_tetromino.y + y) * self.block_size,
+                             self.block_size, self.block_size), 1
                         )
+
+    def draw_placement_hint(self, screen, placement):
+        """어시스트 모드: 추천 위치(PlacementSearch 결과)를 테두리로만 그립니다."""
+        if placement is None:
+            return
+        for y, row in enumerate(placement.shape):
+            for x, cell in enumerate(row):
+                if cell:
+                    pygame.draw.rect(
+                        screen, WHITE,
+                        (self.grid_x + (placement.x + x) * self.block_size,
+                         self.grid_y + (placement.y + y) * self.block_size,
+                         self.block_size, self.block_size), 2
+                    )
@@ -3,6 +3,7 @@
 # -----------------------------------------------------------------------------
 
 import cv2
+import os
 import pygame
 import random
 import time
@@ -11,27 +12,58 @@ from collections import deque, Counter
 from settings import *
 from pose_detector import PoseDetector
 from game_logic import GameLogic
+from array_board import ArrayGameLogic
 from block_templates import POSE_TEMPLATES
+from frame_profiler import FrameMemoryProfiler
+from placement_search import PlacementSearch
+from telemetry import TelemetryWriter
+from motion_predictor import MotionPredictor
+from similarity_cache import SimilarityCache
+from video_recorder import VideoRecorder
 
 
 # ---------------------------------------------------------------------
 # UI 헬퍼: 텍스트 / 후보 블록 / 카운트다운 바
+# 좌표와 크기는 모두 SCREEN_WIDTH x SCREEN_HEIGHT 기준으로 받고,
+# 그릴 때 ui()로 내부 렌더링 해상도(RENDER_WIDTH x RENDER_HEIGHT)에 맞춥니다.
 # ---------------------------------------------------------------------
+UI_SCALE = RENDER_WIDTH / SCREEN_WIDTH
+_font_cache = {}
+
+# 메모리 계측 (settings.MEMORY_PROFILE). UI 헬퍼가 만드는 Surface도 세도록 모듈 수준에 둠
+profiler = FrameMemoryProfiler(MEMORY_BUDGET_BYTES, MEMORY_BUDGET_OBJECTS, MEMORY_STAGE_BUDGETS)
+
+
+def ui(value):
+    """기준 해상도의 좌표/크기를 내부 렌더링 해상도로 변환합니다."""
+    return int(round(value * UI_SCALE))
+
+
+def get_font(size):
+    """크기별 폰트를 한 번만 만들어 재사용합니다 (매 프레임 폰트 로딩 방지)."""
+    font = _font_cache.get(size)
+    if font is None:
+        font = _font_cache[size] = pygame.font.Font(None, max(1, ui(size)))
+    return font
+
+
+@profiler.profiled('draw')
 def draw_text(screen, text, size, x, y, color=WHITE, bg_color=(0, 0, 0), alpha=160):
-    font = pygame.font.Font(None, size)
-    text_surface = font.render(text, True, color)
-    text_rect = text_surface.get_rect(center=(x, y))
+    font = get_font(size)
+    text_surface = profiler.count_surface(font.render(text, True, color))
+    text_rect = text_surface.get_rect(center=(ui(x), ui(y)))
 
     if bg_color:
-        bg_rect = text_rect.inflate(20, 10)
-        bg_surface = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
+        bg_rect = text_rect.inflate(ui(20), ui(10))
+        bg_surface = profiler.count_surface(pygame.Surface(bg_rect.size, pygame.SRCALPHA))
         bg_surface.fill((*bg_color, alpha))
         screen.blit(bg_surface, bg_rect.topleft)
 
     screen.blit(text_surface, text_rect)
 
 
-def draw_candidate_blocks(screen, candidates, selected_zone=None):
+@profiler.profiled('draw')
+def draw_candidate_blocks(screen, candidates, selected_zone=None, recommended=None):
     if not candidates:
         return
 
@@ -40,11 +72,13 @@ def draw_candidate_blocks(screen, candidates, selected_zone=None):
         zone_x = i * zone_width
 
         if selected_zone == i:
-            highlight_surface = pygame.Surface((zone_width, 200), pygame.SRCALPHA)
+            highlight_surface = profiler.count_surface(pygame.Surface((ui(zone_width), ui(200)), pygame.SRCALPHA))
             highlight_surface.fill((80, 80, 80, 130))
-            screen.blit(highlight_surface, (zone_x, 0))
+            screen.blit(highlight_surface, (ui(zone_x), 0))
 
-        draw_text(screen, template['name'], 26, zone_x + zone_width // 2, 90, bg_color=None)
+        # 어시스트 모드: 추천 블록은 이름을 노란색으로 표시
+        name_color = YELLOW if recommended == i else WHITE
+        draw_text(screen, template['name'], 26, zone_x + zone_width // 2, 90, color=name_color, bg_color=None)
 
         shape = template['shape']
         for r, row in enumerate(shape):
@@ -52,10 +86,16 @@ def draw_candidate_blocks(screen, candidates, selected_zone=None):
                 if cell:
                     bx = zone_x + zone_width // 2 + c * 20 - (len(row) * 20 // 2)
                     by = 130 + r * 20
-                    pygame.draw.rect(screen, WHITE, (bx, by, 20, 20))
-                    pygame.draw.rect(screen, GRAY, (bx, by, 20, 20), 1)
+                    cell_rect = (ui(bx), ui(by), ui(20), ui(20))
+                    pygame.draw.rect(screen, WHITE, cell_rect)
+                    pygame.draw.rect(screen, GRAY, cell_rect, 1)
+
+        # 블록 칸에 가려지지 않도록 칸을 그린 뒤에 배경과 함께 표시
+        if recommended == i:
+            draw_text(screen, "BEST", 24, zone_x + zone_width // 2, 190, color=YELLOW)
 
 
+@profiler.profiled('draw')
 def draw_countdown_bar(screen, elapsed, total, center_y):
     progress = min(1.0, max(0.0, elapsed / total))
     BAR_W, BAR_H = 300, 30
@@ -64,8 +104,8 @@ def draw_countdown_bar(screen, elapsed, total, center_y):
     y = center_y
 
     # 채워진 부분과 테두리
-    pygame.draw.rect(screen, GREEN, (x, y, BAR_W * progress, BAR_H))
-    pygame.draw.rect(screen, WHITE, (x, y, BAR_W, BAR_H), 2)
+    pygame.draw.rect(screen, GREEN, (ui(x), ui(y), ui(BAR_W * progress), ui(BAR_H)))
+    pygame.draw.rect(screen, WHITE, (ui(x), ui(y), ui(BAR_W), ui(BAR_H)), 2)
 
 
 # ---------------------------------------------------------------------
@@ -73,7 +113,14 @@ def draw_countdown_bar(screen, elapsed, total, center_y):
 # ---------------------------------------------------------------------
 def main():
     pygame.init()
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    # 내부 해상도가 기준 해상도와 다르거나 전체 화면이면 pygame.SCALED로 한 번에 확대 출력
+    display_flags = 0
+    if RENDER_SCALE != 1.0 or DISPLAY_FULLSCREEN:
+        display_flags |= pygame.SCALED
+    if DISPLAY_FULLSCREEN:
+        display_flags |= pygame.FULLSCREEN
+    vsync = 1 if DISPLAY_VSYNC and display_flags & pygame.SCALED else 0
+    screen = pygame.display.set_mode((RENDER_WIDTH, RENDER_HEIGHT), display_flags, vsync=vsync)
     pygame.display.set_caption("Human Tetris")
     clock = pygame.time.Clock()
 
@@ -82,8 +129,54 @@ def main():
         print("ERROR: Cannot access camera.")
         return
 
+    # 세션 기록 (settings.TELEMETRY_ENABLED)
+    telemetry = TelemetryWriter(TELEMETRY_DIR, TELEMETRY_QUEUE_SIZE,
+                                TELEMETRY_BATCH_SIZE, TELEMETRY_FLUSH_INTERVAL)
+    if TELEMETRY_ENABLED:
+        telemetry.start()
+
+    # 게임 화면 녹화 (settings.RECORD_VIDEO)
+    video_recorder = VideoRecorder(
+        os.path.join(VIDEO_DIR, f"replay-{time.strftime('%Y%m%d-%H%M%S')}.mp4"),
+        (VIDEO_WIDTH, VIDEO_HEIGHT), VIDEO_FPS, VIDEO_QUEUE_SIZE)
+    if RECORD_VIDEO:
+        video_recorder.start()
+
+    try:
+        run_game(screen, clock, cap, telemetry, video_recorder)
+    finally:
+        # 예외(모델 파일 없음, Ctrl-C 등)로 끝나도 카메라를 놓고 녹화/세션 파일을 마무리
+        cap.release()
+        if RECORD_VIDEO:
+            video_recorder.close()
+            telemetry.record('video', path=video_recorder.path, **video_recorder.stats())
+        pygame.quit()
+        telemetry.close()
+
+    if MEMORY_PROFILE:
+        print(profiler.report())
+        profiler.stop()
+        # 벤치마크 실행에서 예산을 넘었다면 MemoryBudgetExceeded로 실패 처리
+        profiler.check_budget()
+
+
+def run_game(screen, clock, cap, telemetry, video_recorder):
+    """게임 루프. 창/카메라/기록 장치의 정리는 호출한 main()이 맡습니다."""
     pose_detector = PoseDetector()
-    game_logic = GameLogic()
+    if GIANT_BOARD_MODE:
+        # 대형 보드: NumPy 그리드 + surfarray 렌더링, 화면에 맞게 칸 크기 계산
+        block_size = max(1, min((RENDER_WIDTH - ui(40)) // GIANT_GRID_COLS,
+                                (RENDER_HEIGHT - ui(40)) // GIANT_GRID_ROWS))
+        game_logic = ArrayGameLogic(telemetry, GIANT_GRID_ROWS, GIANT_GRID_COLS, block_size,
+                                    (RENDER_WIDTH, RENDER_HEIGHT))
+    else:
+        game_logic = GameLogic(telemetry, block_size=max(1, ui(BLOCK_SIZE)),
+                               screen_size=(RENDER_WIDTH, RENDER_HEIGHT))
+    similarity_cache = SimilarityCache(POSE_TEMPLATES, SIMILARITY_CACHE_QUANTIZATION,
+                                       SIMILARITY_CACHE_SIZE)
+    motion_predictor = MotionPredictor(PREDICTION_MIN_CUTOFF, PREDICTION_BETA,
+                                       max_lead=PREDICTION_MAX_LEAD)
+    placement_search = PlacementSearch(rows=game_logic.rows, cols=game_logic.cols) if ASSIST_MODE else None
 
     # ---------------------------------------------------------
     # 설정 (RECOGNITION_DURATION 추가)
@@ -97,14 +190,30 @@ def main():
     candidate_blocks = []
     recognition_start = None
     recognition_counter = Counter()
+    recognition_first_hit = {}  # 템플릿별로 처음 임계값을 넘은 시점 (인식 시작 기준, 초)
+    calibration_round = 0       # 라벨 기록 모드(CALIBRATION_TARGETS)에서 몇 번째 인식 단계인지
 
     auto_select_start = None
     fall_timer_start = time.time()
 
     shoulder_x_history = deque(maxlen=10)
 
+    # 그리드 반투명 배경은 크기가 고정이므로 한 번만 생성
+    grid_surface = pygame.Surface((game_logic.grid_width, game_logic.grid_height), pygame.SRCALPHA)
+    grid_surface.fill((0, 0, 0, 150))
+
+    if MEMORY_PROFILE:
+        profiler.start()
+
+    frame_count = 0
+    frame_time_total = 0.0
+    frame_time_max = 0.0
+
     running = True
     while running:
+        frame_start = time.perf_counter()
+        profiler.begin_frame()
+
         # 이벤트
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
@@ -116,21 +225,34 @@ def main():
         success, img = cap.read()
         if not success:
             continue
-
-        img = cv2.flip(img, 1)  # 거울 모드
-        img_posed = pose_detector.find_pose(img.copy(), draw=True)
-        lm_list = pose_detector.get_landmarks_list(img)
-        user_vectors = pose_detector.get_body_vectors(lm_list) if lm_list else None
+        capture_time = time.monotonic()
+
+        with profiler.stage('camera'):
+            img = cv2.flip(img, 1)  # 거울 모드
+
+        with profiler.stage('pose'):
+            img_posed = pose_detector.find_pose(img.copy(), draw=True, timestamp=capture_time)
+            lm_list = pose_detector.get_landmarks_list(img)
+            if MOTION_PREDICTION:
+                # 새 결과가 왔을 때만 그 결과가 나온 프레임의 촬영 시각으로 반영하고,
+                # 화면에 보일 시점의 위치를 예측
+                if pose_detector.new_result:
+                    motion_predictor.update(lm_list, pose_detector.landmarks_time)
+                lm_list = motion_predictor.predict(time.monotonic() + PREDICTION_DISPLAY_LATENCY)
+            if RECORD_LANDMARKS and game_state == STATE_RECOGNITION and lm_list:
+                # 오프라인 보정 도구(calibrate.py)용 기록: 예측까지 적용해 실제로 매칭에 쓰는 랜드마크
+                # 라벨 기록 모드에서는 화면에 보여준 목표 자세를 정답(label)으로 함께 남김
+                labels = {'label': CALIBRATION_TARGETS[calibration_round % len(CALIBRATION_TARGETS)]} \
+                    if CALIBRATION_TARGETS else {}
+                telemetry.record('landmarks', points=[lm[1:3] for lm in lm_list], size=img.shape[1::-1], **labels)
+            user_vectors = pose_detector.get_body_vectors(lm_list) if lm_list else None
 
         cam_width = img.shape[1]
 
         # 각 템플릿과 유사도 계산 (Recognition에서 top 후보 표시용)
-        similarities = []
-        if user_vectors:
-            for key, template in POSE_TEMPLATES.items():
-                sim = PoseDetector.compare_poses(template['vectors'], user_vectors)
-                similarities.append((key, sim))
-            similarities.sort(key=lambda x: x[1], reverse=True)
+        # 자세를 유지하는 동안에는 캐시된 순위를 재사용
+        with profiler.stage('match'):
+            similarities = similarity_cache.rank(user_vectors)
 
         # 어깨 중심으로 zone 계산
         current_zone = None
@@ -144,18 +266,21 @@ def main():
             current_zone = max(0, min(zone_count - 1, current_zone))
 
         # 화면 그리기 (카메라 배경)
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        cam_surf = pygame.image.frombuffer(img_rgb.tobytes(), img_rgb.shape[1::-1], "RGB")
-        cam_surf = pygame.transform.scale(cam_surf, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        screen.blit(cam_surf, (0, 0))
-
-        grid_surface = pygame.Surface((GRID_WIDTH, GRID_HEIGHT), pygame.SRCALPHA)
-        grid_surface.fill((0, 0, 0, 150))
-        screen.blit(grid_surface, (GRID_X, GRID_Y))
-
-        draw_grid_border = lambda s: pygame.draw.rect(s, GRAY, (GRID_X - 2, GRID_Y - 2, GRID_WIDTH + 4, GRID_HEIGHT + 4), 2)
-        draw_grid_border(screen)
-        game_logic.draw_grid(screen)
+        with profiler.stage('background'):
+            img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+            cam_surf = profiler.count_surface(
+                pygame.image.frombuffer(img_rgb.tobytes(), img_rgb.shape[1::-1], "RGB"), fixed=True)
+            cam_surf = profiler.count_surface(pygame.transform.scale(cam_surf, (RENDER_WIDTH, RENDER_HEIGHT)), fixed=True)
+            screen.blit(cam_surf, (0, 0))
+
+        # 그리드 그리기 (UI 헬퍼는 각자 'draw' 단계로 측정됨)
+        with profiler.stage('draw'):
+            screen.blit(grid_surface, (game_logic.grid_x, game_logic.grid_y))
+
+            draw_grid_border = lambda s: pygame.draw.rect(s, GRAY, (game_logic.grid_x - 2, game_logic.grid_y - 2,
+                                                                    game_logic.grid_width + 4, game_logic.grid_height + 4), 2)
+            draw_grid_border(screen)
+            game_logic.draw_grid(screen)
         draw_text(screen, f"Score: {game_logic.score}", 40, 150, 50)
 
         # -----------------------------
@@ -165,8 +290,13 @@ def main():
             if recognition_start is None:
                 recognition_start = time.time()
                 recognition_counter = Counter()
+                recognition_first_hit = {}
 
-            draw_text(screen, "POSE as you NEED!", 44, SCREEN_WIDTH // 2, 50)
+            if CALIBRATION_TARGETS:
+                target = CALIBRATION_TARGETS[calibration_round % len(CALIBRATION_TARGETS)]
+                draw_text(screen, f"POSE: {POSE_TEMPLATES[target]['name']}", 44, SCREEN_WIDTH // 2, 50, color=YELLOW)
+            else:
+                draw_text(screen, "POSE as you NEED!", 44, SCREEN_WIDTH // 2, 50)
 
             if user_vectors and similarities:
                 realtime_top3 = [k for k, _ in similarities[:3]]
@@ -176,6 +306,7 @@ def main():
                 top1_key, top1_score = similarities[0]
                 if top1_score > POSE_SIMILARITY_THRESHOLD:
                     recognition_counter[top1_key] += 1
+                    recognition_first_hit.setdefault(top1_key, time.time() - recognition_start)
 
             elapsed = time.time() - recognition_start
             draw_text(screen, f"Recognizing... {elapsed:.1f}s / {RECOGNITION_DURATION:.1f}s", 26, SCREEN_WIDTH // 2, 220)
@@ -191,10 +322,15 @@ def main():
                             break
 
                 candidate_blocks = [POSE_TEMPLATES[k] for k in final_keys]
+                # recognition_time: 최종 1순위 후보가 처음 임계값을 넘기까지 걸린 시간 (못 넘었으면 None)
+                telemetry.record('recognition', window=elapsed, candidates=final_keys,
+                                 recognition_time=recognition_first_hit.get(final_keys[0]) if final_keys else None,
+                                 counts=dict(recognition_counter))
                 auto_select_start = None
                 game_state = STATE_SELECTION
                 recognition_start = None
                 recognition_counter = Counter()
+                calibration_round += 1
 
         # -----------------------------
         # SELECTION STATE
@@ -208,7 +344,12 @@ def main():
                 continue
 
             draw_text(screen, "Move into a Zone to Select a Block", 32, SCREEN_WIDTH // 2, 50)
-            draw_candidate_blocks(screen, candidate_blocks, current_zone)
+            recommended = None
+            if placement_search:
+                ranked = placement_search.rank_candidates(game_logic.grid, candidate_blocks)
+                if ranked[0][1] is not None:
+                    recommended = ranked[0][0]
+            draw_candidate_blocks(screen, candidate_blocks, current_zone, recommended)
 
             if auto_select_start is None:
                 auto_select_start = time.time()
@@ -222,6 +363,8 @@ def main():
                     chosen_block = candidate_blocks[current_zone]
                 else:
                     chosen_block = random.choice(candidate_blocks)
+                telemetry.record('selection', block=chosen_block['name'], zone=current_zone,
+                                 candidates=[c['name'] for c in candidate_blocks])
 
                 game_logic.create_tetromino(chosen_block)
                 fall_timer_start = time.time()
@@ -235,6 +378,7 @@ def main():
         elif game_state == STATE_PLAYING:
             if game_logic.game_over:
                 game_state = STATE_GAME_OVER
+                telemetry.record('game_over', score=game_logic.score)
                 continue
 
             if time.time() - fall_timer_start > INITIAL_FALL_INTERVAL:
@@ -252,7 +396,13 @@ def main():
                 elif shoulder_center_x_screen > zone_third * 2:
                     game_logic.move(1, 0)
 
-            game_logic.draw_current_tetromino(screen)
+            hint = None
+            if placement_search and game_logic.current_tetromino:
+                hint = placement_search.best_placement(game_logic.grid, {'shape': game_logic.current_tetromino.shape})
+            with profiler.stage('draw'):
+                if hint is not None:
+                    game_logic.draw_placement_hint(screen, hint)
+                game_logic.draw_current_tetromino(screen)
 
             if game_logic.current_tetromino is None:
                 game_state = STATE_RECOGNITION
@@ -266,16 +416,39 @@ def main():
             draw_text(screen, "Press 'Q' to Quit", 30, SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50)
 
         # 포즈 미리보기
-        img_posed_rgb = cv2.cvtColor(img_posed, cv2.COLOR_BGR2RGB)
-        img_posed_pygame = pygame.image.frombuffer(img_posed_rgb.tobytes(), img_posed_rgb.shape[1::-1], "RGB")
-        pose_view = pygame.transform.scale(img_posed_pygame, (320, 240))
-        screen.blit(pose_view, (20, SCREEN_HEIGHT - 260))
+        with profiler.stage('preview'):
+            img_posed_rgb = cv2.cvtColor(img_posed, cv2.COLOR_BGR2RGB)
+            img_posed_pygame = profiler.count_surface(
+                pygame.image.frombuffer(img_posed_rgb.tobytes(), img_posed_rgb.shape[1::-1], "RGB"), fixed=True)
+            pose_view = profiler.count_surface(pygame.transform.scale(img_posed_pygame, (ui(320), ui(240))), fixed=True)
+            screen.blit(pose_view, (ui(20), ui(SCREEN_HEIGHT - 260)))
 
         pygame.display.flip()
+        video_recorder.capture(screen)
+        profiler.end_frame()
+
+        # 프레임 통계 (clock.tick 대기 시간 제외)
+        frame_time = time.perf_counter() - frame_start
+        frame_count += 1
+        frame_time_total += frame_time
+        frame_time_max = max(frame_time_max, frame_time)
+        if frame_count % TELEMETRY_FRAME_STATS_INTERVAL == 0:
+            telemetry.record('frame_stats', frames=TELEMETRY_FRAME_STATS_INTERVAL,
+                             avg_ms=frame_time_total / TELEMETRY_FRAME_STATS_INTERVAL * 1000,
+                             max_ms=frame_time_max * 1000, fps=clock.get_fps(),
+                             similarity_hit_rate=similarity_cache.hit_rate)
+            frame_time_total = 0.0
+            frame_time_max = 0.0
+
         clock.tick(FPS)
 
-    cap.release()
-    pygame.quit()
+        if MEMORY_PROFILE:
+            if profiler.frame_count % MEMORY_REPORT_INTERVAL == 0:
+                print(profiler.report())
+            if MEMORY_PROFILE_FRAMES and profiler.frame_count >= MEMORY_PROFILE_FRAMES:
+                running = False
+
+    pose_detector.close()
 
 
 if __name__ == '__main__':
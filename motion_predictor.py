@@ -0,0 +1,105 @@
+# -----------------------------------------------------------------------------
+# motion_predictor.py
+#
+# 랜드마크 지연 보정용 예측 필터.
+#
+# 게임은 카메라 촬영 + 포즈 추정 + 루프 지연만큼 늦은 위치를 보고 움직입니다.
+# 랜드마크마다 One-Euro 필터로 위치와 속도를 추정하고,
+# 등속 운동을 가정해 "지금(또는 화면에 보일 시점)"의 위치를 앞당겨 예측합니다.
+# 모든 랜드마크를 NumPy 배열 하나로 한 번에 계산합니다.
+# -----------------------------------------------------------------------------
+
+import math
+
+import numpy as np
+
+
+class MotionPredictor:
+    """
+    랜드마크 위치를 One-Euro 필터로 다듬고 앞으로의 위치를 예측하는 클래스.
+
+    사용 예:
+        if pose_detector.new_result:
+            predictor.update(lm_list, pose_detector.landmarks_time)
+        lm_list = predictor.predict(time.monotonic())
+
+    update()에는 새로 도착한 결과만, 그 결과가 나온 프레임의 촬영 시각과 함께 넘겨야 합니다.
+    (같은 결과를 반복해서 넘기면 속도가 0으로 추정됩니다.)
+    """
+    def __init__(self, min_cutoff=1.0, beta=0.05, d_cutoff=1.0, max_lead=0.2):
+        """
+        :param min_cutoff: 정지 상태에서의 최소 차단 주파수 (Hz, 작을수록 떨림이 줄고 반응이 느려짐)
+        :param beta: 속도에 따른 차단 주파수 증가량 (클수록 빠른 움직임에 덜 늦음)
+        :param d_cutoff: 속도 추정용 차단 주파수 (Hz)
+        :param max_lead: 최대 예측 시간 (초). 오래된 측정으로 너무 멀리 예측하지 않도록 제한
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_lead = max_lead
+        self.reset()
+
+    def reset(self):
+        """추적 상태를 초기화합니다 (사람이 화면에서 사라졌을 때 등)."""
+        self._ids = None
+        self._measured = None   # 직전 측정 위치 (N, 2)
+        self._position = None   # 필터링된 위치 (N, 2)
+        self._velocity = None   # 필터링된 속도 (N, 2), 픽셀/초
+        self._timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def update(self, lm_list, timestamp):
+        """
+        새 측정값을 반영합니다.
+
+        :param lm_list: PoseDetector.get_landmarks_list() 결과 ([id, x, y] 리스트)
+        :param timestamp: 측정(카메라 촬영) 시각 (초, time.monotonic 기준)
+        """
+        if not lm_list:
+            self.reset()
+            return
+
+        ids = [lm[0] for lm in lm_list]
+        measured = np.array([lm[1:3] for lm in lm_list], dtype=np.float64)
+
+        if self._position is None or ids != self._ids or timestamp <= self._timestamp:
+            self._ids = ids
+            self._measured = measured
+            self._position = measured
+            self._velocity = np.zeros_like(measured)
+            self._timestamp = timestamp
+            return
+
+        dt = timestamp - self._timestamp
+
+        # 1. 속도 추정 (측정값 차분을 저역 통과 필터링)
+        raw_velocity = (measured - self._measured) / dt
+        a_d = self._alpha(self.d_cutoff, dt)
+        self._velocity = a_d * raw_velocity + (1 - a_d) * self._velocity
+
+        # 2. 속도가 빠를수록 차단 주파수를 높여서 지연을 줄임 (랜드마크별)
+        speed = np.hypot(self._velocity[:, 0], self._velocity[:, 1])[:, None]
+        cutoff = self.min_cutoff + self.beta * speed
+        tau = 1.0 / (2 * math.pi * cutoff)
+        a = 1.0 / (1.0 + tau / dt)
+        self._position = a * measured + (1 - a) * self._position
+
+        self._measured = measured
+        self._timestamp = timestamp
+
+    def predict(self, timestamp):
+        """
+        주어진 시각의 랜드마크 위치를 예측합니다.
+
+        :param timestamp: 예측할 시각 (초, 보통 현재 시각 + 화면 출력 지연)
+        :return: get_landmarks_list()와 같은 형식의 리스트 (추적 중이 아니면 빈 리스트)
+        """
+        if self._position is None:
+            return []
+        lead = min(max(0.0, timestamp - self._timestamp), self.max_lead)
+        predicted = self._position + self._velocity * lead
+        return [[i, int(x), int(y)] for i, (x, y) in zip(self._ids, predicted)]
@@ -0,0 +1,214 @@
+# -----------------------------------------------------------------------------
+# placement_search.py
+#
+# 현재 그리드에서 블록을 어디에 놓는 것이 좋은지 평가하는 탐색 엔진.
+# (어시스트/힌트 오버레이, 후보 블록 순위 매기기에 사용)
+#
+# 그리드의 각 줄을 비트마스크(int)로 바꿔서 충돌 검사와 줄 제거를
+# 정수 연산으로 처리하고, 평가 결과는 보드 해시 기준으로 캐시합니다.
+# 매 프레임 호출해도 프레임 예산 안에 들어가도록 하는 것이 목표입니다.
+# -----------------------------------------------------------------------------
+
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from settings import GRID_ROWS, GRID_COLS
+
+# 탐색 결과 하나: 블록 왼쪽 위 좌표(x, y), 놓인 모양, 점수, 지워지는 줄 수
+Placement = namedtuple('Placement', ['x', 'y', 'shape', 'score', 'lines_cleared'])
+
+# 휴리스틱 가중치 기본값 (높이 합, 지운 줄, 구멍, 울퉁불퉁함)
+DEFAULT_WEIGHTS = {
+    'aggregate_height': -0.510066,
+    'lines_cleared': 0.760666,
+    'holes': -0.35663,
+    'bumpiness': -0.184483,
+}
+
+
+def rotate_shape(shape):
+    """모양을 시계 방향으로 90도 회전시킵니다 (Tetromino.rotate와 동일)."""
+    return [list(row) for row in zip(*shape[::-1])]
+
+
+def shape_key(shape):
+    """모양(2차원 리스트)을 캐시 키로 쓸 수 있는 튜플로 바꿉니다."""
+    return tuple(tuple(1 if cell else 0 for cell in row) for row in shape)
+
+
+class PlacementSearch:
+    """
+    그리드와 블록 모양을 받아 가능한 모든 놓을 위치를 평가하는 클래스.
+    """
+    def __init__(self, weights=None, rows=GRID_ROWS, cols=GRID_COLS,
+                 allow_rotation=False, cache_size=4096):
+        """
+        :param weights: 휴리스틱 가중치 (DEFAULT_WEIGHTS와 같은 키)
+        :param allow_rotation: True면 회전된 모양도 탐색합니다.
+                               현재 게임은 플레이 중 회전이 없으므로 기본값은 False.
+        :param cache_size: 캐시에 보관할 최대 평가 결과 수 (LRU)
+        """
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            self.weights.update(weights)
+        self.rows = rows
+        self.cols = cols
+        self.allow_rotation = allow_rotation
+        self.full_row = (1 << cols) - 1
+
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    # ---------------------------------------------------------------------
+    # 보드 변환
+    # ---------------------------------------------------------------------
+    @staticmethod
+    def board_from_grid(grid):
+        """
+        GameLogic.grid(0 = 빈칸)를 줄별 비트마스크 튜플로 바꿉니다.
+        x번째 칸이 차 있으면 해당 줄 값의 x번째 비트가 1입니다.
+        ArrayGameLogic의 NumPy 그리드는 packbits로 한 번에 변환합니다.
+        """
+        if isinstance(grid, np.ndarray):
+            packed = np.packbits(grid != 0, axis=1, bitorder='little')
+            return tuple(int.from_bytes(row.tobytes(), 'little') for row in packed)
+
+        board = []
+        for row in grid:
+            mask = 0
+            for x, cell in enumerate(row):
+                if cell != 0:
+                    mask |= 1 << x
+            board.append(mask)
+        return tuple(board)
+
+    def _orientations(self, shape):
+        """탐색할 모양 목록 (중복 회전 제거)."""
+        keys = [shape_key(shape)]
+        if self.allow_rotation:
+            rotated = shape
+            for _ in range(3):
+                rotated = rotate_shape(rotated)
+                key = shape_key(rotated)
+                if key not in keys:
+                    keys.append(key)
+        return keys
+
+    # ---------------------------------------------------------------------
+    # 탐색
+    # ---------------------------------------------------------------------
+    def evaluate(self, grid, shape_info):
+        """
+        주어진 블록을 놓을 수 있는 모든 위치를 평가합니다.
+
+        :param grid: GameLogic.grid 또는 board_from_grid()로 만든 비트마스크 튜플
+        :param shape_info: 'shape' 키를 가진 블록 템플릿
+        :return: 점수 내림차순으로 정렬된 Placement 리스트 (놓을 곳이 없으면 빈 리스트)
+        """
+        board = grid if isinstance(grid, tuple) else self.board_from_grid(grid)
+        key = (board, shape_key(shape_info['shape']), self.allow_rotation)
+
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        placements = []
+        for orientation in self._orientations(shape_info['shape']):
+            placements.extend(self._search_orientation(board, orientation))
+        placements.sort(key=lambda p: p.score, reverse=True)
+
+        self._cache[key] = placements
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return placements
+
+    def best_placement(self, grid, shape_info):
+        """가장 점수가 높은 위치를 반환합니다 (없으면 None)."""
+        placements = self.evaluate(grid, shape_info)
+        return placements[0] if placements else None
+
+    def rank_candidates(self, grid, candidates):
+        """
+        후보 블록들을 각자의 최선 위치 점수 기준으로 정렬합니다.
+
+        :return: (후보 인덱스, Placement) 리스트, 점수 내림차순.
+                 놓을 곳이 없는 후보는 맨 뒤에 Placement 대신 None으로 들어갑니다.
+        """
+        board = self.board_from_grid(grid) if not isinstance(grid, tuple) else grid
+        ranked = [(i, self.best_placement(board, c)) for i, c in enumerate(candidates)]
+        ranked.sort(key=lambda item: item[1].score if item[1] else float('-inf'), reverse=True)
+        return ranked
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _search_orientation(self, board, shape):
+        """한 가지 모양에 대해 모든 열에서 떨어뜨려 본 결과를 평가합니다."""
+        height = len(shape)
+        width = len(shape[0])
+        piece = [sum(1 << x for x, cell in enumerate(row) if cell) for row in shape]
+        results = []
+
+        for x in range(self.cols - width + 1):
+            rows = [mask << x for mask in piece]
+            # 스폰 위치부터 겹치면 이 열에는 놓을 수 없음
+            if self._collides(board, rows, 0):
+                continue
+            y = 0
+            while y + height < self.rows and not self._collides(board, rows, y + 1):
+                y += 1
+
+            new_board = list(board)
+            for r, mask in enumerate(rows):
+                new_board[y + r] |= mask
+            kept = [row for row in new_board if row != self.full_row]
+            lines = self.rows - len(kept)
+            score = self._score([0] * lines + kept, lines)
+            results.append(Placement(x, y, shape, score, lines))
+        return results
+
+    def _collides(self, board, rows, y):
+        for r, mask in enumerate(rows):
+            if board[y + r] & mask:
+                return True
+        return False
+
+    def _score(self, board, lines):
+        """보드 특징값(높이 합, 구멍, 울퉁불퉁함)과 지운 줄로 점수를 계산합니다."""
+        heights = [0] * self.cols
+        holes = 0
+        seen = 0  # 위에서부터 내려오며 한 번이라도 블록이 있었던 열
+        for r, row in enumerate(board):
+            # 위에 블록이 있는데 비어 있는 칸 = 구멍
+            holes += bin(seen & ~row).count('1')
+            new_cols = row & ~seen
+            if new_cols:
+                for x in range(self.cols):
+                    if new_cols >> x & 1:
+                        heights[x] = self.rows - r
+                seen |= row
+
+        bumpiness = sum(abs(heights[i] - heights[i + 1]) for i in range(self.cols - 1))
+        w = self.weights
+        return (w['aggregate_height'] * sum(heights)
+                + w['lines_cleared'] * lines
+                + w['holes'] * holes
+                + w['bumpiness'] * bumpiness)
+
+    def cache_stats(self):
+        """캐시 적중률 통계를 반환합니다."""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self._cache),
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / total if total else 0.0,
+        }
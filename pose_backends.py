@@ -0,0 +1,306 @@
+# -----------------------------------------------------------------------------
+# pose_backends.py
+#
+# PoseDetector가 사용하는 포즈 추정 백엔드 모음.
+#
+#   - SolutionPoseBackend : 기존 mp.solutions.pose (동기 방식)
+#   - TasksLiveStreamBackend : MediaPipe Tasks PoseLandmarker LIVE_STREAM 모드
+#                              (결과를 콜백으로 받아서 프레임 루프를 막지 않음)
+#   - ReplayPoseBackend : 녹화된 랜드마크를 재생 (테스트/벤치마크용)
+#                         settings.RECORD_LANDMARKS = True로 남긴 세션 파일의 'landmarks' 이벤트를 사용
+#
+# 모든 백엔드는 detect()에서 같은 형태의 결과를 반환합니다:
+#   .x, .y (0~1 정규화 좌표)를 가진 랜드마크 33개의 리스트, 감지 실패 시 None
+# 반환한 결과가 어느 프레임에서 나온 것인지는 result_timestamp_ms에 남깁니다.
+# (비동기 백엔드는 이전 프레임의 결과를 반환할 수 있음)
+# -----------------------------------------------------------------------------
+
+import glob
+import os
+import threading
+import time
+from collections import namedtuple
+
+from telemetry import read_events
+
+# 재생/합성 백엔드에서 사용하는 랜드마크 형식 (MediaPipe 랜드마크와 같은 속성 이름)
+Landmark = namedtuple('Landmark', ['x', 'y', 'z', 'visibility'])
+
+
+class PoseBackend:
+    """포즈 추정 백엔드의 공통 인터페이스."""
+    name = 'base'
+    # 마지막 detect() 결과가 나온 프레임의 타임스탬프 (밀리초, 결과가 없으면 None)
+    result_timestamp_ms = None
+    # 결과가 나올 때마다 on_result(timestamp_ms, landmarks)를 호출 (벤치마크용, 비동기 백엔드는 다른 스레드에서 호출)
+    on_result = None
+
+    def _notify(self, timestamp_ms, landmarks):
+        if self.on_result is not None:
+            self.on_result(timestamp_ms, landmarks)
+
+    def detect(self, img_rgb, timestamp_ms):
+        """
+        RGB 이미지에서 포즈를 찾습니다.
+
+        :param img_rgb: RGB 형식의 이미지 (numpy 배열)
+        :param timestamp_ms: 프레임 시각 (밀리초, 호출마다 증가해야 함)
+        :return: 랜드마크 리스트 또는 None
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SolutionPoseBackend(PoseBackend):
+    """기존 mp.solutions.pose API를 사용하는 동기 백엔드."""
+    name = 'solution'
+
+    def __init__(self, detection_confidence=0.5, tracking_confidence=0.5, model_complexity=1):
+        import mediapipe as mp
+        self.pose = mp.solutions.pose.Pose(
+            static_image_mode=False,
+            model_complexity=model_complexity,
+            smooth_landmarks=True,
+            min_detection_confidence=detection_confidence,
+            min_tracking_confidence=tracking_confidence
+        )
+
+    def detect(self, img_rgb, timestamp_ms):
+        results = self.pose.process(img_rgb)
+        self.result_timestamp_ms = timestamp_ms
+        landmarks = results.pose_landmarks.landmark if results.pose_landmarks else None
+        self._notify(timestamp_ms, landmarks)
+        return landmarks
+
+    def close(self):
+        self.pose.close()
+
+
+class TasksLiveStreamBackend(PoseBackend):
+    """
+    MediaPipe Tasks PoseLandmarker의 LIVE_STREAM 모드 백엔드.
+    detect()는 프레임을 비동기로 넘기기만 하고, 지금까지 도착한 가장 최근 결과를 반환합니다.
+    (따라서 결과는 한두 프레임 늦을 수 있습니다.)
+    """
+    name = 'tasks'
+
+    def __init__(self, model_path, detection_confidence=0.5, tracking_confidence=0.5):
+        import mediapipe as mp
+        from mediapipe.tasks import python as mp_tasks
+        from mediapipe.tasks.python import vision
+
+        self._mp = mp
+        self._lock = threading.Lock()
+        self._latest = None
+        self._latest_timestamp = None
+        self._last_timestamp = -1
+
+        options = vision.PoseLandmarkerOptions(
+            base_options=mp_tasks.BaseOptions(model_asset_path=model_path),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_poses=1,
+            min_pose_detection_confidence=detection_confidence,
+            min_tracking_confidence=tracking_confidence,
+            result_callback=self._on_result
+        )
+        self.landmarker = vision.PoseLandmarker.create_from_options(options)
+
+    def _on_result(self, result, output_image, timestamp_ms):
+        """MediaPipe 내부 스레드에서 호출되는 콜백."""
+        landmarks = result.pose_landmarks[0] if result.pose_landmarks else None
+        with self._lock:
+            self._latest = landmarks
+            self._latest_timestamp = timestamp_ms
+        self._notify(timestamp_ms, landmarks)
+
+    def detect(self, img_rgb, timestamp_ms):
+        # LIVE_STREAM 모드는 타임스탬프가 반드시 증가해야 함
+        timestamp_ms = max(int(timestamp_ms), self._last_timestamp + 1)
+        self._last_timestamp = timestamp_ms
+
+        image = self._mp.Image(image_format=self._mp.ImageFormat.SRGB, data=img_rgb)
+        self.landmarker.detect_async(image, timestamp_ms)
+        with self._lock:
+            self.result_timestamp_ms = self._latest_timestamp
+            return self._latest
+
+    def close(self):
+        self.landmarker.close()
+
+
+class ReplayPoseBackend(PoseBackend):
+    """
+    미리 녹화된 랜드마크 프레임을 순서대로 돌려주는 백엔드.
+    카메라나 MediaPipe 없이 게임 로직을 테스트하거나 벤치마크할 때 사용합니다.
+    """
+    name = 'replay'
+
+    def __init__(self, frames, loop=True):
+        """
+        :param frames: 프레임별 랜드마크 리스트 (각 랜드마크는 (x, y) 또는 (x, y, z, visibility)),
+                       감지 실패 프레임은 None
+        :param loop: 끝까지 재생한 뒤 처음부터 다시 재생할지 여부
+        """
+        self.frames = [self._to_landmarks(f) for f in frames]
+        self.loop = loop
+        self.index = 0
+
+    @staticmethod
+    def _to_landmarks(frame):
+        if frame is None:
+            return None
+        # (x, y)만 있으면 z=0, visibility=1로 채움
+        return [Landmark(*(list(p) + [0.0, 1.0][len(p) - 2:])) for p in frame]
+
+    @classmethod
+    def from_file(cls, path, loop=True, frame_size=(640, 480)):
+        """
+        세션 파일(telemetry.py 형식)의 'landmarks' 이벤트를 불러옵니다.
+
+        :param path: 세션 파일 경로. 디렉터리면 그 안의 가장 최근 session-*.jsonl을 사용
+        :param frame_size: 이벤트에 'size'가 없을 때 픽셀 좌표를 정규화할 카메라 해상도 (width, height)
+        """
+        if os.path.isdir(path):
+            sessions = sorted(glob.glob(os.path.join(path, 'session-*.jsonl')), key=os.path.getmtime)
+            if not sessions:
+                raise FileNotFoundError(f"No session files in {path} (record one with RECORD_LANDMARKS = True)")
+            path = sessions[-1]
+
+        frames = []
+        for e in read_events(path, 'landmarks'):
+            width, height = e.get('size') or frame_size
+            frames.append([(x / width, y / height) for x, y in e['points']])
+        if not frames:
+            raise ValueError(f"No 'landmarks' events in {path} (record with RECORD_LANDMARKS = True)")
+        return cls(frames, loop)
+
+    def detect(self, img_rgb, timestamp_ms):
+        self.result_timestamp_ms = timestamp_ms
+        frame = None
+        if self.frames and (self.loop or self.index < len(self.frames)):
+            self.index %= len(self.frames)
+            frame = self.frames[self.index]
+            self.index += 1
+        self._notify(timestamp_ms, frame)
+        return frame
+
+
+def create_backend(name, detection_confidence=0.5, tracking_confidence=0.5, **options):
+    """
+    이름으로 백엔드를 생성합니다.
+
+    :param name: 'solution', 'tasks', 'replay' 중 하나
+    :param options: 백엔드별 추가 인자 (tasks: model_path, replay: path 또는 frames)
+    """
+    if name == 'solution':
+        return SolutionPoseBackend(detection_confidence, tracking_confidence,
+                                   options.get('model_complexity', 1))
+    if name == 'tasks':
+        if not os.path.exists(options['model_path']):
+            raise FileNotFoundError(f"Pose landmarker model not found: {options['model_path']} "
+                                    f"(download it as described in settings.POSE_TASK_MODEL_PATH)")
+        return TasksLiveStreamBackend(options['model_path'], detection_confidence, tracking_confidence)
+    if name == 'replay':
+        if 'frames' in options:
+            return ReplayPoseBackend(options['frames'], options.get('loop', True))
+        return ReplayPoseBackend.from_file(options['path'], options.get('loop', True))
+    raise ValueError(f"Unknown pose backend: {name}")
+
+
+def benchmark(backends, frames, fps=30, drain_timeout=1.0):
+    """
+    여러 백엔드에 같은 프레임들을 실제 카메라처럼 fps 간격으로 넣어 보고 성능을 비교합니다.
+
+    비동기 백엔드는 detect()가 바로 돌아오므로 호출 시간만으로는 비교할 수 없습니다.
+    그래서 프레임을 넣은 시각부터 그 프레임의 결과가 on_result로 도착한 시각까지를 지연 시간으로,
+    초당 도착한 결과 수를 처리량으로 측정합니다. (LIVE_STREAM은 바쁠 때 프레임을 건너뜀)
+
+    :param backends: PoseBackend 리스트
+    :param frames: RGB 이미지 리스트
+    :param fps: 프레임을 넣는 속도 (카메라 fps)
+    :param drain_timeout: 마지막 프레임을 넣은 뒤 남은 결과를 기다릴 최대 시간 (초)
+    :return: {백엔드 이름: {'submit_ms', 'latency_p50_ms', 'latency_p90_ms',
+                             'results_per_sec', 'result_rate', 'detection_rate'}}
+    """
+    results = {}
+    interval = 1.0 / fps
+    for backend in backends:
+        submitted = {}   # 타임스탬프 -> 넣은 시각
+        arrived = {}     # 타임스탬프 -> (도착 시각, 감지 여부)
+        lock = threading.Lock()
+
+        def on_result(timestamp_ms, landmarks):
+            now = time.perf_counter()
+            with lock:
+                arrived[timestamp_ms] = (now, landmarks is not None)
+
+        backend.on_result = on_result
+        submit_time = 0.0
+        start = time.perf_counter()
+        for i, frame in enumerate(frames):
+            # 카메라처럼 정해진 시각에 프레임을 넣음 (처리가 늦으면 기다리지 않고 바로 넣음)
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            timestamp_ms = int(i * interval * 1000)
+            with lock:
+                submitted[timestamp_ms] = time.perf_counter()
+            t = time.perf_counter()
+            backend.detect(frame, timestamp_ms)
+            submit_time += time.perf_counter() - t
+
+        # 아직 도착하지 않은 결과를 기다림
+        deadline = time.perf_counter() + drain_timeout
+        while time.perf_counter() < deadline:
+            with lock:
+                if len(arrived) >= len(submitted):
+                    break
+            time.sleep(0.005)
+        backend.on_result = None
+
+        with lock:
+            latencies = sorted(arrived[ts][0] - submitted[ts] for ts in arrived if ts in submitted)
+            detected = sum(1 for _, found in arrived.values() if found)
+            last_arrival = max((a for a, _ in arrived.values()), default=start)
+        count = len(latencies)
+        results[backend.name] = {
+            'submit_ms': submit_time / max(1, len(frames)) * 1000,
+            'latency_p50_ms': latencies[count // 2] * 1000 if count else None,
+            'latency_p90_ms': latencies[int(count * 0.9)] * 1000 if count else None,
+            'results_per_sec': len(arrived) / (last_arrival - start) if last_arrival > start else 0.0,
+            'result_rate': len(arrived) / max(1, len(frames)),
+            'detection_rate': detected / max(1, len(arrived)),
+        }
+    return results
+
+
+if __name__ == '__main__':
+    # 사용법: python pose_backends.py  (카메라에서 프레임을 모아 백엔드별 속도 비교)
+    import cv2
+    from settings import POSE_TASK_MODEL_PATH
+
+    cap = cv2.VideoCapture(0)
+    frames = []
+    while len(frames) < 150:
+        success, img = cap.read()
+        if not success:
+            break
+        frames.append(cv2.cvtColor(cv2.flip(img, 1), cv2.COLOR_BGR2RGB))
+    cap.release()
+
+    backends = [create_backend('solution')]
+    try:
+        backends.append(create_backend('tasks', model_path=POSE_TASK_MODEL_PATH))
+    except (OSError, RuntimeError) as e:
+        print(f"tasks backend unavailable: {e}")
+
+    for name, stats in benchmark(backends, frames).items():
+        p50, p90 = stats['latency_p50_ms'], stats['latency_p90_ms']
+        latency = f"{p50:.1f}/{p90:.1f} ms" if p50 is not None else "-"
+        print(f"{name:<10} submit {stats['submit_ms']:.2f} ms, latency p50/p90 {latency}, "
+              f"{stats['results_per_sec']:.1f} results/s ({stats['result_rate']:.0%} of frames), "
+              f"detected {stats['detection_rate']:.0%}")
+    for backend in backends:
+        backend.close()
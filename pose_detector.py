@@ -3,44 +3,79 @@
 #
 # MediaPipe를 사용하여 사용자의 포즈를 감지하고,
 # 신체 주요 관절의 각도를 계산하여 벡터로 반환하는 클래스.
+# 실제 포즈 추정은 pose_backends.py의 백엔드가 담당합니다.
 # -----------------------------------------------------------------------------
 
 import cv2
-import mediapipe as mp
 import numpy as np
 import math
+import time
+
+from settings import POSE_BACKEND, POSE_TASK_MODEL_PATH, POSE_REPLAY_PATH
+from pose_backends import create_backend
+
+# 랜드마크 연결선 (mp.solutions.pose.POSE_CONNECTIONS와 동일)
+POSE_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+]
 
 class PoseDetector:
     """
-    MediaPipe Pose 모델을 사용하여 신체 포즈를 감지하는 클래스.
+    포즈 추정 백엔드를 사용하여 신체 포즈를 감지하는 클래스.
     """
-    def __init__(self, detection_confidence=0.5, tracking_confidence=0.5):
-        # MediaPipe Pose 모델 초기화
-        self.mp_pose = mp.solutions.pose
-        self.pose = self.mp_pose.Pose(
-            static_image_mode=False,
-            model_complexity=1,
-            smooth_landmarks=True,
-            min_detection_confidence=detection_confidence,
-            min_tracking_confidence=tracking_confidence
-        )
-        self.mp_draw = mp.solutions.drawing_utils
+    def __init__(self, detection_confidence=0.5, tracking_confidence=0.5, backend=None):
+        """
+        :param backend: pose_backends.PoseBackend 객체.
+                        없으면 settings.POSE_BACKEND 이름으로 생성합니다.
+        """
+        if backend is None:
+            backend = create_backend(POSE_BACKEND, detection_confidence, tracking_confidence,
+                                     model_path=POSE_TASK_MODEL_PATH, path=POSE_REPLAY_PATH)
+        self.backend = backend
         self.landmarks = None
+        self.landmarks_time = None   # 현재 랜드마크가 나온 프레임의 시각 (초, time.monotonic 기준)
+        self.new_result = False      # 이번 find_pose()에서 새 결과가 도착했는지 여부
+
+    def close(self):
+        self.backend.close()
 
-    def find_pose(self, img, draw=True):
+    def _draw_landmarks(self, img):
+        """백엔드 종류와 상관없이 랜드마크와 연결선을 이미지에 그립니다."""
+        h, w, _ = img.shape
+        points = [(int(lm.x * w), int(lm.y * h)) for lm in self.landmarks]
+        for a, b in POSE_CONNECTIONS:
+            if a < len(points) and b < len(points):
+                cv2.line(img, points[a], points[b], (255, 255, 255), 2)
+        for p in points:
+            cv2.circle(img, p, 4, (0, 0, 255), cv2.FILLED)
+
+    def find_pose(self, img, draw=True, timestamp=None):
         """
         입력 이미지에서 포즈를 찾고, 결과 랜드마크 위에 선을 그립니다.
         
         :param img: 처리할 이미지 (OpenCV BGR 형식)
         :param draw: 랜드마크 위에 그림을 그릴지 여부
+        :param timestamp: 이미지 촬영 시각 (초, time.monotonic 기준, 없으면 현재 시각)
         :return: 랜드마크가 그려진 이미지
         """
+        if timestamp is None:
+            timestamp = time.monotonic()
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        results = self.pose.process(img_rgb)
-        self.landmarks = results.pose_landmarks
+        self.landmarks = self.backend.detect(img_rgb, timestamp * 1000)
+
+        # 비동기 백엔드는 이전 프레임의 결과를 반복해서 돌려줄 수 있으므로 결과의 시각으로 구분
+        result_ms = self.backend.result_timestamp_ms
+        result_time = result_ms / 1000 if result_ms is not None else None
+        self.new_result = result_time is not None and result_time != self.landmarks_time
+        if result_time is not None:
+            self.landmarks_time = result_time
 
         if self.landmarks and draw:
-            self.mp_draw.draw_landmarks(img, self.landmarks, self.mp_pose.POSE_CONNECTIONS)
+            self._draw_landmarks(img)
         
         return img
 
@@ -54,12 +89,13 @@ class PoseDetector:
         lm_list = []
         if self.landmarks:
             h, w, _ = img.shape
-            for id, lm in enumerate(self.landmarks.landmark):
+            for id, lm in enumerate(self.landmarks):
                 cx, cy = int(lm.x * w), int(lm.y * h)
                 lm_list.append([id, cx, cy])
         return lm_list
 
-    def _calculate_angle(self, lm_list, p1, p2, p3):
+    @staticmethod
+    def _calculate_angle(lm_list, p1, p2, p3):
         """세 점(p1, p2, p3) 사이의 각도를 계산합니다. p2가 중심점입니다."""
         try:
             x1, y1 = lm_list[p1][1:]
@@ -75,7 +111,8 @@ class PoseDetector:
         except IndexError:
             return 0 # 랜드마크가 감지되지 않은 경우
 
-    def get_body_vectors(self, lm_list):
+    @staticmethod
+    def get_body_vectors(lm_list):
         """
         주요 신체 부위의 각도를 계산하여 벡터(딕셔너리) 형태로 반환합니다.
         
@@ -86,12 +123,12 @@ class PoseDetector:
             return None
 
         vectors = {
-            'right_arm': self._calculate_angle(lm_list, 11, 13, 15), # R Shoulder, Elbow, Wrist
-            'left_arm': self._calculate_angle(lm_list, 12, 14, 16),  # L Shoulder, Elbow, Wrist
-            'right_leg': self._calculate_angle(lm_list, 23, 25, 27), # R Hip, Knee, Ankle
-            'left_leg': self._calculate_angle(lm_list, 24, 26, 28),   # L Hip, Knee, Ankle
-            'right_body': self._calculate_angle(lm_list, 11, 23, 25),# R Shoulder, Hip, Knee
-            'left_body': self._calculate_angle(lm_list, 12, 24, 26), # L Shoulder, Hip, Knee
+            'right_arm': PoseDetector._calculate_angle(lm_list, 11, 13, 15), # R Shoulder, Elbow, Wrist
+            'left_arm': PoseDetector._calculate_angle(lm_list, 12, 14, 16),  # L Shoulder, Elbow, Wrist
+            'right_leg': PoseDetector._calculate_angle(lm_list, 23, 25, 27), # R Hip, Knee, Ankle
+            'left_leg': PoseDetector._calculate_angle(lm_list, 24, 26, 28),   # L Hip, Knee, Ankle
+            'right_body': PoseDetector._calculate_angle(lm_list, 11, 23, 25),# R Shoulder, Hip, Knee
+            'left_body': PoseDetector._calculate_angle(lm_list, 12, 24, 26), # L Shoulder, Hip, Knee
         }
         return vectors
 
@@ -10,6 +10,16 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 FPS = 30
 
+# 내부 렌더링 해상도 설정
+# 화면은 RENDER_SCALE 배율의 해상도로 그린 뒤, 디스플레이 크기에 맞게 한 번에 확대/축소됩니다.
+# (저사양 기기: 0.5~0.75, 4K 디스플레이: 1.0 + DISPLAY_FULLSCREEN)
+# UI 좌표는 SCREEN_WIDTH x SCREEN_HEIGHT 기준으로 작성하고 그릴 때 배율을 적용합니다.
+RENDER_SCALE = 1.0
+RENDER_WIDTH = int(SCREEN_WIDTH * RENDER_SCALE)
+RENDER_HEIGHT = int(SCREEN_HEIGHT * RENDER_SCALE)
+DISPLAY_FULLSCREEN = False  # 전체 화면으로 확대 출력
+DISPLAY_VSYNC = False       # 수직 동기화 (확대 출력(pygame.SCALED)일 때만 적용)
+
 # 게임 그리드(테트리스 판) 설정
 GRID_ROWS = 20
 GRID_COLS = 10
@@ -47,6 +57,65 @@ STATE_GAME_OVER = 4    # 5. 게임 오버
 POSE_CONFIDENCE_THRESHOLD = 0.5  # MediaPipe가 포즈를 감지했다고 판단하는 최소 신뢰도
 POSE_SIMILARITY_THRESHOLD = 0.7  # 사용자의 포즈가 템플릿과 얼마나 유사해야 하는지에 대한 임계값
 POSE_SELECTION_TIME = 3          # 블록 선택을 위해 포즈를 유지해야 하는 시간 (초)
+SIMILARITY_CACHE_QUANTIZATION = 5  # 유사도 캐시 키를 만들 때 각도를 반올림할 간격 (도)
+SIMILARITY_CACHE_SIZE = 512        # 유사도 캐시 최대 항목 수
 
 # 블록 떨어지는 속도 (숫자가 작을수록 빠름)
 INITIAL_FALL_INTERVAL = 0.3  # 0.3초에 한 칸씩 떨어짐
+
+# 동작 예측 설정 (motion_predictor.py)
+# 카메라/포즈 추정 지연을 보정하기 위해 랜드마크 위치를 앞당겨 예측합니다.
+MOTION_PREDICTION = True
+PREDICTION_MIN_CUTOFF = 1.0        # 정지 시 떨림 제거 강도 (Hz, 작을수록 부드러움)
+PREDICTION_BETA = 0.05             # 빠르게 움직일 때 지연을 줄이는 정도
+PREDICTION_MAX_LEAD = 0.2          # 최대 예측 시간 (초)
+PREDICTION_DISPLAY_LATENCY = 0.03  # 화면 출력까지 걸리는 추가 지연 (초)
+
+# 메모리 계측 설정 (frame_profiler.py)
+MEMORY_PROFILE = False            # True면 프레임/단계별 할당량과 GC 정지 시간을 측정
+MEMORY_BUDGET_BYTES = 0           # 프레임당 허용 할당량 (heap + 고정 크기가 아닌 Surface 바이트, 0이면 검사하지 않음)
+                                  # 카메라 버퍼가 대부분이므로 회귀 검사에는 아래 단계별 예산을 권장
+MEMORY_STAGE_BUDGETS = {}         # 단계별 허용 할당량, 예: {'draw': 100_000, 'match': 10_000} (바이트)
+MEMORY_BUDGET_OBJECTS = 0         # 프레임당 허용 GC 객체 생성 수 (0이면 검사하지 않음)
+MEMORY_PROFILE_FRAMES = 0         # 벤치마크 모드: 이 프레임 수만큼 돌고 종료 (0이면 무제한)
+MEMORY_REPORT_INTERVAL = 300      # 몇 프레임마다 리포트를 출력할지
+
+# 어시스트 모드 (placement_search.py)
+ASSIST_MODE = False               # True면 추천 블록과 추천 위치를 화면에 표시 (초보자용)
+
+# 세션 기록 설정 (telemetry.py)
+TELEMETRY_ENABLED = True          # 세션 이벤트를 파일로 기록할지 여부
+TELEMETRY_DIR = "sessions"        # 세션 파일(.jsonl)을 저장할 폴더
+TELEMETRY_QUEUE_SIZE = 1024       # 쓰기 대기 큐 크기 (가득 차면 이벤트를 버림)
+TELEMETRY_BATCH_SIZE = 64         # 한 번에 묶어서 쓸 이벤트 수
+TELEMETRY_FLUSH_INTERVAL = 1.0    # 최소 이 시간(초)마다 파일에 씀
+TELEMETRY_FRAME_STATS_INTERVAL = 300  # 몇 프레임마다 프레임 통계를 기록할지
+RECORD_LANDMARKS = False          # 인식 단계의 랜드마크를 세션 파일에 기록 (calibrate.py 입력용)
+# 라벨 기록 모드: 템플릿 키 목록 (예: ["I_0", "T_0", "L_0"]). 비어 있지 않으면 인식 단계마다
+# 차례로 목표 자세를 화면에 보여주고, 'landmarks' 이벤트에 그 키를 정답(label)으로 기록합니다.
+CALIBRATION_TARGETS = []
+
+# 대형 보드 모드 (array_board.py)
+# 벽면 디스플레이 등 큰 화면용. NumPy 그리드와 surfarray 렌더링을 사용하며
+# 칸 크기는 화면에 맞게 자동으로 계산됩니다.
+GIANT_BOARD_MODE = False
+GIANT_GRID_ROWS = 64
+GIANT_GRID_COLS = 128
+
+# 포즈 추정 백엔드 (pose_backends.py)
+# "solution": mp.solutions.pose (동기), "tasks": Tasks PoseLandmarker LIVE_STREAM (비동기),
+# "replay": 녹화된 랜드마크 재생 (테스트/벤치마크용)
+POSE_BACKEND = "solution"
+# tasks 백엔드용 모델 파일 (저장소에 포함되지 않음). 아래 주소에서 받아 이 경로에 둡니다:
+# https://storage.googleapis.com/mediapipe-models/pose_landmarker/pose_landmarker_full/float16/latest/pose_landmarker_full.task
+POSE_TASK_MODEL_PATH = "pose_landmarker_full.task"
+# replay 백엔드용 세션 파일 (RECORD_LANDMARKS = True로 기록). 디렉터리면 가장 최근 세션을 사용
+POSE_REPLAY_PATH = TELEMETRY_DIR
+
+# 게임 화면 녹화 설정 (video_recorder.py)
+RECORD_VIDEO = False              # True면 게임 화면을 동영상으로 저장 (다시 보기 클립)
+VIDEO_DIR = "recordings"          # 동영상을 저장할 폴더
+VIDEO_WIDTH = 640                 # 동영상 해상도
+VIDEO_HEIGHT = 360
+VIDEO_FPS = 15                    # 동영상 프레임 속도
+VIDEO_QUEUE_SIZE = 30             # 인코딩 대기 큐 크기 (가득 차면 프레임을 버림)
@@ -0,0 +1,94 @@
+# -----------------------------------------------------------------------------
+# similarity_cache.py
+#
+# 포즈 유사도 계산 결과를 캐시하는 모듈.
+#
+# 인식/선택 단계에서 플레이어는 거의 같은 자세를 유지하므로,
+# 관절 각도를 일정 간격(quantization)으로 반올림한 값을 키로 삼아
+# 모든 템플릿과의 유사도 순위를 재사용합니다. (LRU 방식으로 크기 제한)
+# 캐시는 템플릿 변경을 스스로 감지하지 않습니다 (조회마다 템플릿을 검사하면 캐시의 이득이 사라짐).
+# 템플릿을 바꾸면 set_templates()를, POSE_TEMPLATES를 제자리에서 수정했다면 invalidate()를 호출해야 합니다.
+# -----------------------------------------------------------------------------
+
+from collections import OrderedDict
+
+from pose_detector import PoseDetector
+
+
+class SimilarityCache:
+    """
+    양자화된 포즈 벡터 -> 템플릿 유사도 순위를 저장하는 LRU 캐시.
+    """
+    def __init__(self, templates, quantization=5, max_size=512):
+        """
+        :param templates: POSE_TEMPLATES 형식의 딕셔너리
+        :param quantization: 각도를 반올림할 간격 (도). 클수록 적중률이 높고 정확도는 낮아짐
+                             (부위별 오차는 최대 quantization / 2 도)
+        :param max_size: 보관할 최대 항목 수
+        """
+        self.quantization = quantization
+        self.max_size = max_size
+        self._cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.set_templates(templates)
+
+    def set_templates(self, templates):
+        """템플릿 목록을 바꾸고 캐시를 비웁니다."""
+        self.templates = templates
+        self.invalidate()
+
+    def invalidate(self):
+        """
+        캐시를 비웁니다.
+        템플릿 딕셔너리를 제자리에서 수정(각도 변경, 템플릿 추가/삭제)한 뒤에는 반드시 호출해야 합니다.
+        """
+        self._cache.clear()
+
+    def _quantize(self, user_vectors):
+        q = self.quantization
+        return tuple(sorted((key, (round(angle / q) * q) % 360) for key, angle in user_vectors.items()))
+
+    def rank(self, user_vectors):
+        """
+        모든 템플릿과의 유사도를 높은 순서로 반환합니다.
+
+        :param user_vectors: PoseDetector.get_body_vectors() 결과
+        :return: (템플릿 키, 유사도) 튜플의 튜플 (공유되는 값이므로 수정하지 말 것)
+        """
+        if not user_vectors:
+            return ()
+
+        key = self._quantize(user_vectors)
+        ranked = self._cache.get(key)
+        if ranked is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return ranked
+
+        self.misses += 1
+        # 같은 키에는 항상 같은 결과가 나오도록 양자화된 각도로 계산
+        quantized = dict(key)
+        similarities = [(name, PoseDetector.compare_poses(template['vectors'], quantized))
+                        for name, template in self.templates.items()]
+        similarities.sort(key=lambda x: x[1], reverse=True)
+        ranked = tuple(similarities)
+
+        self._cache[key] = ranked
+        if len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+        return ranked
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        """캐시 적중률 통계를 반환합니다."""
+        return {
+            'size': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
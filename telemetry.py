@@ -0,0 +1,225 @@
+# -----------------------------------------------------------------------------
+# telemetry.py
+#
+# 세션 기록(인식 시간, 선택한 블록, 지운 줄, 프레임 통계, 점수 등)을
+# 로컬 파일에 남기는 모듈.
+#
+# 프레임 루프는 이벤트를 큐에 넣기만 하고, 실제 디스크 쓰기는
+# 백그라운드 스레드가 묶어서(batch) 처리합니다.
+# 파일은 한 줄에 이벤트 하나인 JSON Lines 형식이며 덧붙이기만 합니다.
+# -----------------------------------------------------------------------------
+
+import json
+import os
+import queue
+import threading
+import time
+from collections import Counter
+
+_STOP = object()  # 백그라운드 스레드 종료 신호
+
+
+class TelemetryWriter:
+    """
+    이벤트를 비동기로 파일에 기록하는 클래스.
+    start()를 호출하기 전에는 record()가 아무 일도 하지 않습니다.
+    """
+    def __init__(self, directory, queue_size=1024, batch_size=64, flush_interval=1.0):
+        """
+        :param directory: 세션 파일을 저장할 폴더
+        :param queue_size: 대기 큐 최대 길이 (가득 차면 새 이벤트는 버림)
+        :param batch_size: 한 번에 모아서 쓸 최대 이벤트 수
+        :param flush_interval: 이벤트가 적어도 이 시간(초)마다 파일에 씀
+        """
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # 같은 초에 시작한 세션이 같은 파일에 섞이지 않도록 프로세스 ID를 붙임
+        self.session_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        self.path = os.path.join(directory, f"session-{self.session_id}.jsonl")
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self.dropped = 0   # 큐가 가득 차서(또는 쓰기 스레드가 멈춰서) 버린 이벤트 수
+        self.written = 0   # 파일에 쓴 이벤트 수
+        self.failed = 0    # 직렬화/디스크 오류로 쓰지 못한 이벤트 수
+        self.error = None  # 마지막으로 발생한 쓰기 오류
+
+    def start(self):
+        """
+        백그라운드 쓰기 스레드를 시작합니다.
+        폴더를 만들 수 없으면 (읽기 전용 등) 경고만 출력하고 기록 없이 진행합니다.
+        """
+        if self._thread:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+        except OSError as e:
+            self.error = e
+            print(f"WARNING: telemetry disabled: {e}")
+            return
+        self._thread = threading.Thread(target=self._run, name="telemetry-writer", daemon=True)
+        self._thread.start()
+        self.record('session_start', session=self.session_id)
+
+    def record(self, event, **fields):
+        """
+        이벤트 하나를 큐에 넣습니다. 프레임 루프를 막지 않도록 절대 기다리지 않습니다.
+
+        :param event: 이벤트 이름 (예: 'recognition', 'lines_cleared')
+        :param fields: 함께 저장할 값들 (JSON으로 바꿀 수 있어야 함)
+        """
+        if not self._thread:
+            return
+        if not self._thread.is_alive():
+            self.dropped += 1
+            return
+        fields['event'] = event
+        fields['t'] = time.time()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=2.0):
+        """
+        남은 이벤트를 쓰고 스레드를 종료합니다.
+        쓰기 스레드가 멈췄거나 디스크가 느려도 timeout 이상 기다리지 않습니다.
+        """
+        if not self._thread:
+            return
+        self.record('session_end', written=self.written, dropped=self.dropped, failed=self.failed)
+        if self._thread.is_alive():
+            deadline = time.monotonic() + timeout
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+            self._thread.join(max(0.0, deadline - time.monotonic()))
+        if self.error:
+            print(f"WARNING: telemetry writer error: {self.error} "
+                  f"(failed {self.failed}, dropped {self.dropped})")
+        self._thread = None
+
+    def _run(self):
+        try:
+            f = open(self.path, 'a', encoding='utf-8')
+        except OSError as e:
+            # 파일을 열 수 없으면 스레드를 끝냄 (record()는 이후 이벤트를 버리기만 함)
+            self.error = e
+            return
+        with f:
+            stopping = False
+            while not stopping:
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                # batch_size만큼 모이거나 flush_interval이 지날 때까지 모음
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+
+                if batch:
+                    self._write_batch(f, batch)
+
+    def _write_batch(self, f, batch):
+        """이벤트 묶음을 파일에 씁니다. 오류가 나도 스레드는 계속 동작합니다."""
+        lines = []
+        for e in batch:
+            try:
+                # JSON으로 바꿀 수 없는 값은 문자열로 기록
+                lines.append(json.dumps(e, separators=(',', ':'), default=str) + '\n')
+            except (TypeError, ValueError) as err:
+                self.failed += 1
+                self.error = err
+        if not lines:
+            return
+        try:
+            f.write(''.join(lines))
+            f.flush()
+            self.written += len(lines)
+        except OSError as err:
+            self.failed += len(lines)
+            self.error = err
+
+
+# ---------------------------------------------------------------------
+# 오프라인 분석용 리더
+# ---------------------------------------------------------------------
+def read_events(path, event=None):
+    """
+    세션 파일의 이벤트를 하나씩 돌려주는 제너레이터.
+    비정상 종료로 마지막 줄이 잘린 경우 그 줄은 건너뜁니다.
+
+    :param event: 지정하면 해당 이름의 이벤트만 반환
+    """
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                e = json.loads(line)
+            except ValueError:
+                continue
+            if event is None or e.get('event') == event:
+                yield e
+
+
+def summarize(paths):
+    """
+    여러 세션 파일을 읽어 간단한 통계를 계산합니다.
+
+    :param paths: 세션 파일 경로 리스트
+    :return: 세션 수, 점수, 지운 줄, 블록 선택 횟수, 평균 인식 시간, 평균 프레임 시간 등
+    """
+    sessions = 0
+    scores = []
+    lines_cleared = 0
+    chosen_blocks = Counter()
+    recognition_times = []
+    frame_times = []
+
+    for path in paths:
+        sessions += 1
+        for e in read_events(path):
+            name = e.get('event')
+            if name == 'game_over':
+                scores.append(e.get('score', 0))
+            elif name == 'lines_cleared':
+                lines_cleared += e.get('lines', 0)
+            elif name == 'selection':
+                chosen_blocks[e.get('block')] += 1
+            elif name == 'recognition':
+                # 임계값을 넘은 후보가 없었던 인식 단계는 제외
+                if e.get('recognition_time') is not None:
+                    recognition_times.append(e['recognition_time'])
+            elif name == 'frame_stats':
+                frame_times.append(e.get('avg_ms', 0))
+
+    return {
+        'sessions': sessions,
+        'games': len(scores),
+        'best_score': max(scores) if scores else 0,
+        'avg_score': sum(scores) / len(scores) if scores else 0,
+        'lines_cleared': lines_cleared,
+        'chosen_blocks': dict(chosen_blocks),
+        'avg_recognition_s': sum(recognition_times) / len(recognition_times) if recognition_times else 0,
+        'avg_frame_ms': sum(frame_times) / len(frame_times) if frame_times else 0,
+    }
+
+
+if __name__ == '__main__':
+    import glob
+    import sys
+
+    # 사용법: python telemetry.py [세션 폴더]
+    from settings import TELEMETRY_DIR
+    directory = sys.argv[1] if len(sys.argv) > 1 else TELEMETRY_DIR
+    for key, value in summarize(sorted(glob.glob(os.path.join(directory, '*.jsonl')))).items():
+        print(f"{key}: {value}")
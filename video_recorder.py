@@ -0,0 +1,183 @@
+# -----------------------------------------------------------------------------
+# video_recorder.py
+#
+# 게임 화면을 동영상 파일(다시 보기 클립)로 저장하는 모듈.
+#
+# 프레임 루프는 화면을 작은 버퍼로 복사해서 큐에 넣기만 하고,
+# 인코딩(cv2.VideoWriter)은 백그라운드 스레드가 처리합니다.
+# 큐가 가득 차면 새 프레임을 버려서 게임 프레임 속도를 지킵니다.
+#
+# 프레임마다 녹화 시작 후의 슬롯 번호(경과 시간 x fps)를 함께 넘기고,
+# 인코더가 빈 슬롯(버린 프레임, 게임 FPS가 동영상 fps보다 낮을 때)을 직전 프레임으로 채워서
+# 동영상 길이가 실제 플레이 시간과 같도록 유지합니다.
+# -----------------------------------------------------------------------------
+
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+import pygame
+
+_STOP = object()  # 인코딩 스레드 종료 신호
+
+
+class VideoRecorder:
+    """
+    화면 프레임을 비동기로 동영상 파일에 기록하는 클래스.
+    start()를 호출하기 전에는 capture()가 아무 일도 하지 않습니다.
+    """
+    def __init__(self, path, size, fps=15, queue_size=30, fourcc='mp4v'):
+        """
+        :param path: 저장할 동영상 파일 경로
+        :param size: 동영상 해상도 (width, height). 화면과 다르면 캡처할 때 축소합니다.
+        :param fps: 동영상 프레임 속도 (게임 FPS보다 낮으면 프레임을 건너뛰며 캡처하고,
+                    높으면 직전 프레임을 반복해서 채움)
+        :param queue_size: 인코딩 대기 큐 최대 길이 (가득 차면 프레임을 버림)
+        :param fourcc: cv2.VideoWriter 코덱 코드
+        """
+        self.path = path
+        self.size = size
+        self.fps = fps
+        self.fourcc = fourcc
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._writer = None
+        self._scaled = None          # 축소용으로 재사용하는 서피스
+        self._start_time = None
+        self._next_slot = 0          # 다음으로 캡처할 슬롯 번호
+        self._abort = threading.Event()
+
+        self.captured = 0   # 큐에 넣은 프레임 수
+        self.dropped = 0    # 큐가 가득 차서 버린 프레임 수
+        self.encoded = 0    # 파일에 쓴 프레임 수 (반복 포함)
+        self.repeated = 0   # 빈 슬롯을 채우려고 반복해서 쓴 프레임 수
+        self.error = None   # 인코딩 중 발생한 오류
+
+    def start(self):
+        """
+        인코더를 열고 백그라운드 스레드를 시작합니다.
+        파일을 열 수 없으면 경고만 출력하고 녹화 없이 진행합니다 (capture()는 아무 일도 하지 않음).
+        """
+        if self._thread:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.size)
+            if not self._writer.isOpened():
+                raise IOError(f"cannot open video writer: {self.path}")
+        except (OSError, cv2.error) as e:
+            self.error = e
+            print(f"WARNING: video recording disabled: {e}")
+            return
+        self._start_time = time.monotonic()
+        self._next_slot = 0
+        self._abort.clear()
+        # 데몬 스레드가 아니므로 close()가 먼저 끝나더라도 프로세스 종료 전에 writer를 release함
+        self._thread = threading.Thread(target=self._run, name="video-encoder")
+        self._thread.start()
+
+    def capture(self, surface):
+        """
+        화면 서피스를 한 프레임 캡처합니다. 절대 기다리지 않습니다.
+        동영상 fps에 맞춰 필요한 프레임만 캡처합니다.
+        """
+        if not self._thread or not self._thread.is_alive():
+            return
+        slot = int((time.monotonic() - self._start_time) * self.fps)
+        if slot < self._next_slot:
+            return
+        # 건너뛴 슬롯은 인코더가 직전 프레임으로 채움
+        self._next_slot = slot + 1
+
+        if self._queue.full():
+            self.dropped += 1
+            return
+
+        if surface.get_size() != self.size:
+            if self._scaled is None:
+                self._scaled = pygame.Surface(self.size, 0, surface)
+            pygame.transform.scale(surface, self.size, self._scaled)
+            surface = self._scaled
+
+        try:
+            self._queue.put_nowait((slot, pygame.image.tobytes(surface, 'RGB')))
+            self.captured += 1
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """
+        남은 프레임을 인코딩하고 파일을 닫습니다.
+        timeout 안에 끝나지 않으면 남은 프레임을 버리고 인코더를 멈추게 한 뒤 돌아옵니다.
+        (인코더는 쓰던 프레임을 마치면 writer를 release하므로 파일은 항상 마무리됩니다.)
+        """
+        if not self._thread:
+            return
+        if self._thread.is_alive():
+            deadline = time.monotonic() + timeout
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                self._abort.set()
+            self._thread.join(max(0.0, deadline - time.monotonic()))
+            if self._thread.is_alive():
+                self._abort.set()
+                print(f"WARNING: video encoder did not finish in {timeout:.1f}s; "
+                      f"{self._queue.qsize()} frames discarded")
+        if self.error:
+            print(f"WARNING: video encoder error: {self.error} (encoded {self.encoded} frames)")
+        self._thread = None
+
+    def _run(self):
+        width, height = self.size
+        last_frame = None
+        last_slot = -1
+        try:
+            while not self._abort.is_set():
+                try:
+                    item = self._queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _STOP:
+                    # 마지막에 버려진 슬롯까지 채움
+                    self._fill(last_frame, self._next_slot - last_slot - 1)
+                    break
+                slot, data = item
+                # 빈 슬롯을 직전 프레임으로 채워서 실제 시간과 길이를 맞춤
+                self._fill(last_frame, slot - last_slot - 1)
+                frame = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+                last_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                last_slot = slot
+                self._writer.write(last_frame)
+                self.encoded += 1
+        except Exception as e:
+            # 스레드가 죽어도 close()가 기다리지 않도록 오류만 남기고 종료
+            self.error = e
+        finally:
+            self._writer.release()
+
+    def _fill(self, frame, count):
+        if frame is None:
+            return
+        for _ in range(count):
+            if self._abort.is_set():
+                return
+            self._writer.write(frame)
+            self.encoded += 1
+            self.repeated += 1
+
+    def stats(self):
+        """캡처/버림/인코딩 프레임 수를 반환합니다."""
+        return {
+            'captured': self.captured,
+            'dropped': self.dropped,
+            'encoded': self.encoded,
+            'repeated': self.repeated,
+            'pending': self._queue.qsize(),
+        }